@@ -0,0 +1,66 @@
+"""Solve one day against a whole directory of puzzle inputs.
+
+Every worker in the pool imports the day (and, on first use, any heavy lazy
+imports such as sympy) once, then handles as many inputs as it is given.
+Answers are streamed to stdout as JSON lines in completion order.
+
+    python batch.py dec_20 ~/inputs/dec_20/ > answers.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict
+
+from bench import load_day
+
+_DAY = None
+
+
+def init_worker(day: str) -> None:
+    global _DAY
+    _DAY = load_day(day)
+
+
+def to_json(answer: Any) -> Any:
+    # numpy scalars and the like
+    if hasattr(answer, "item"):
+        return answer.item()
+    return answer
+
+
+def solve(fpath: str) -> Dict[str, Any]:
+    result = {"input": fpath, "pid": os.getpid()}
+    start = time.perf_counter()
+    try:
+        with open(fpath, "r") as f:
+            model = _DAY.parse(f.read())
+        result["part1"] = to_json(_DAY.part1(model))
+        result["part2"] = to_json(_DAY.part2(model))
+    except Exception as e:
+        result["error"] = repr(e)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("day", help="e.g. dec_07")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    fpaths = sorted(str(p) for p in args.input_dir.glob(args.pattern) if p.is_file())
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=init_worker, initargs=(args.day,)
+    ) as pool:
+        futures = [pool.submit(solve, fpath) for fpath in fpaths]
+        for future in as_completed(futures):
+            sys.stdout.write(json.dumps(future.result()) + "\n")
+            sys.stdout.flush()
@@ -0,0 +1,349 @@
+"""Benchmark runner for the 2022 solutions.
+
+Each day is run in a fresh child process, inside a scratch directory holding a
+synthetic ``input.txt``/``test_input.txt`` (see ``synthetic.py``). Days that
+expose ``parse(text)``, ``part1(model)`` and ``part2(model)`` are timed per
+phase; anything else is timed as a single ``main`` phase by executing the
+script's ``__main__`` block.
+
+Every phase records wall time (also reported as throughput, in units of the
+day's ``size``), the process peak RSS once the phase finished, how much the
+phase raised that peak (none, if it needed less than an earlier phase) and the
+net number of allocated blocks (plus the tracemalloc peak when
+``--trace-alloc`` is given). Records are appended to a JSON lines or CSV
+history, and compared against the previous record for the same day/size/phase.
+
+``--import-budget`` instead checks the cumulative ``python -X importtime`` cost
+of importing each day against ``IMPORT_BUDGET_MS``, taking the fastest of
+``--import-samples`` imports.
+
+    python bench.py --days dec_16 dec_19 --sizes 10 50 --history bench_history.csv
+    python bench.py --import-budget
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import multiprocessing as mp
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import synthetic
+
+ROOT = Path(__file__).resolve().parent
+PHASES = ["parse", "part1", "part2"]
+FIELDS = [
+    "timestamp",
+    "commit",
+    "day",
+    "size",
+    "seed",
+    "phase",
+    "wall_s",
+    "peak_rss_kb",
+    "rss_growth_kb",
+    "alloc_blocks",
+    "alloc_peak_bytes",
+    "status",
+]
+DEFAULT_SIZES = [100]
+# days whose size-100 input doesn't finish within the default --timeout; dec_23
+# takes ~6s at 50 (a 50 x 50 grove, about the real input's 72 x 72 in 26s)
+DAY_SIZES = {"dec_23": [50]}
+# imports per day, the fastest one is checked so a cold cache doesn't fail it
+IMPORT_SAMPLES = 5
+# most days take ~20ms at best, mostly dataclasses
+DEFAULT_IMPORT_BUDGET_MS = 30
+# days whose parse path needs numpy take ~70-75ms at best
+IMPORT_BUDGET_MS = {
+    "dec_08": 100,
+    "dec_12": 100,
+    "dec_14": 100,
+    "dec_15": 100,
+    "dec_18": 100,
+    "dec_22": 100,
+}
+
+
+def all_days() -> List[str]:
+    return sorted(p.parent.name for p in ROOT.glob("dec_*/run.py"))
+
+
+def load_day(day: str, module_name: Optional[str] = None):
+    fpath = ROOT / day / "run.py"
+    spec = importlib.util.spec_from_file_location(
+        module_name or f"aoc2022_{day}", fpath
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def day_inputs(day: str, size: int, seed: int) -> Tuple[str, Dict[str, str]]:
+    """Returns the text handed to ``parse`` and the files for the scratch dir."""
+    if day in synthetic.GENERATORS:
+        text = synthetic.generate(day, size=size, seed=seed)
+        return text, {"input.txt": text, "test_input.txt": text}
+    # no generator for this day, fall back to the checked-in puzzle inputs
+    files = {
+        p.name: p.read_text()
+        for p in [ROOT / day / "input.txt", ROOT / day / "test_input.txt"]
+        if p.exists()
+    }
+    return files.get("test_input.txt", files["input.txt"]), files
+
+
+def measure(fn: Callable[[], Any], trace_alloc: bool) -> Dict[str, Any]:
+    if trace_alloc:
+        tracemalloc.reset_peak()
+    # the peak only ever grows, so a phase shows by how much it raised it
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    blocks_before = sys.getallocatedblocks()
+    start = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "result": result,
+        "wall_s": wall,
+        "peak_rss_kb": peak_rss,
+        "rss_growth_kb": peak_rss - rss_before,
+        "alloc_blocks": sys.getallocatedblocks() - blocks_before,
+        "alloc_peak_bytes": tracemalloc.get_traced_memory()[1] if trace_alloc else None,
+    }
+
+
+def run_day(
+    day: str, text: str, files: Dict[str, str], trace_alloc: bool, conn
+) -> None:
+    """Child process entry point, sends one record per phase back over ``conn``."""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, content in files.items():
+            Path(tmp, name).write_text(content)
+        os.chdir(tmp)
+        sys.path.insert(0, str(ROOT / day))
+        if trace_alloc:
+            tracemalloc.start()
+
+        sink = io.StringIO()
+        phase = "import"
+        try:
+            with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                m = measure(lambda: load_day(day), trace_alloc)
+                module = m.pop("result")
+                records.append({"phase": phase, **m, "status": "ok"})
+
+                if all(hasattr(module, p) for p in PHASES):
+                    phase = "parse"
+                    m = measure(lambda: module.parse(text), trace_alloc)
+                    model = m.pop("result")
+                    records.append({"phase": phase, **m, "status": "ok"})
+                    for phase in PHASES[1:]:
+                        m = measure(lambda: getattr(module, phase)(model), trace_alloc)
+                        m.pop("result")
+                        records.append({"phase": phase, **m, "status": "ok"})
+                else:
+                    phase = "main"
+
+                    def main() -> None:
+                        try:
+                            runpy.run_path(
+                                str(ROOT / day / "run.py"), run_name="__main__"
+                            )
+                        except SystemExit:
+                            pass
+
+                    m = measure(main, trace_alloc)
+                    m.pop("result")
+                    records.append({"phase": phase, **m, "status": "ok"})
+        except Exception as e:
+            records.append({"phase": phase, "status": f"error: {e!r}"})
+    conn.send(records)
+    conn.close()
+
+
+def bench_day(
+    day: str, size: int, seed: int, timeout: float, trace_alloc: bool
+) -> List[Dict[str, Any]]:
+    text, files = day_inputs(day, size=size, seed=seed)
+    ctx = mp.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=run_day, args=(day, text, files, trace_alloc, send))
+    proc.start()
+    send.close()
+    if recv.poll(timeout):
+        records = recv.recv()
+        proc.join()
+    else:
+        proc.terminate()
+        proc.join()
+        records = [{"phase": "-", "status": f"timeout after {timeout}s"}]
+    return records
+
+
+def import_time_ms(day: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import run"],
+        cwd=ROOT / day,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # "import time: self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[-1].strip() == "run":
+            return int(parts[1]) / 1000
+    raise ValueError(f"No importtime entry for {day}")
+
+
+def best_import_time_ms(day: str, samples: int = IMPORT_SAMPLES) -> float:
+    return min(import_time_ms(day) for _ in range(samples))
+
+
+def check_import_budget(days: List[str], samples: int = IMPORT_SAMPLES) -> bool:
+    ok = True
+    for day in days:
+        budget = IMPORT_BUDGET_MS.get(day, DEFAULT_IMPORT_BUDGET_MS)
+        ms = best_import_time_ms(day, samples=samples)
+        over = ms > budget
+        ok = ok and not over
+        print(f"{day:<7} {ms:>8.1f}ms / {budget}ms {'OVER' if over else 'ok'}")
+    return ok
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_history(fpath: Path) -> List[Dict[str, Any]]:
+    if not fpath.exists():
+        return []
+    with open(fpath, "r") as f:
+        if fpath.suffix == ".csv":
+            return list(csv.DictReader(f))
+        return [json.loads(l) for l in f if l.strip()]
+
+
+def append_history(fpath: Path, records: List[Dict[str, Any]]) -> None:
+    new_file = not fpath.exists()
+    with open(fpath, "a") as f:
+        if fpath.suffix == ".csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows({k: r.get(k) for k in FIELDS} for r in records)
+        else:
+            for r in records:
+                f.write(json.dumps({k: r.get(k) for k in FIELDS}) + "\n")
+
+
+def previous_wall(
+    history: List[Dict[str, Any]], record: Dict[str, Any]
+) -> Optional[float]:
+    for old in reversed(history):
+        if (
+            old["day"] == record["day"]
+            and str(old["size"]) == str(record["size"])
+            and old["phase"] == record["phase"]
+            and old["status"] == "ok"
+        ):
+            return float(old["wall_s"])
+    return None
+
+
+def report(record: Dict[str, Any], prev: Optional[float]) -> str:
+    s = f"{record['day']:<7} {record['size']:>9} {record['phase']:<7}"
+    if record["status"] != "ok":
+        return f"{s} {record['status']}"
+    s += f" {record['wall_s'] * 1000:>11.2f}ms"
+    # throughput in the day's own size unit (moves, rounds, lines...)
+    if record["phase"] in PHASES and record["wall_s"] > 0:
+        s += f" {record['size'] / record['wall_s']:>9.3g}/s"
+    s += f" {record['peak_rss_kb']:>9}KB {record['rss_growth_kb']:>+9}KB"
+    s += f" {record['alloc_blocks']:>+10}blk"
+    if record["alloc_peak_bytes"] is not None:
+        s += f" {record['alloc_peak_bytes']:>11}B"
+    if prev:
+        s += f" {100 * (record['wall_s'] - prev) / prev:>+7.1f}%"
+    return s
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", nargs="+", default=all_days())
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        help=f"defaults to {DEFAULT_SIZES}, or DAY_SIZES for the slower days",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--trace-alloc", action="store_true")
+    parser.add_argument("--import-budget", action="store_true")
+    parser.add_argument("--import-samples", type=int, default=IMPORT_SAMPLES)
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=ROOT / "bench_history.jsonl",
+        help="'.csv' for CSV, JSON lines otherwise",
+    )
+    args = parser.parse_args()
+
+    if args.import_budget:
+        sys.exit(0 if check_import_budget(args.days, args.import_samples) else 1)
+
+    history = load_history(args.history)
+    commit = current_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    records = []
+    for day in args.days:
+        for size in args.sizes or DAY_SIZES.get(day, DEFAULT_SIZES):
+            runs = [
+                bench_day(day, size, args.seed, args.timeout, args.trace_alloc)
+                for _ in range(args.repeat)
+            ]
+            # keep the fastest repeat of each phase
+            for i, record in enumerate(runs[0]):
+                candidates = [
+                    r[i] for r in runs if len(r) > i and r[i]["status"] == "ok"
+                ]
+                if candidates:
+                    record = min(candidates, key=lambda r: r["wall_s"])
+                record = {
+                    "timestamp": timestamp,
+                    "commit": commit,
+                    "day": day,
+                    "size": size,
+                    "seed": args.seed,
+                    **record,
+                }
+                print(report(record, previous_wall(history, record)))
+                records.append(record)
+
+    append_history(args.history, records)
@@ -1,5 +1,7 @@
+import heapq
 from dataclasses import dataclass
-from typing import List
+from itertools import chain
+from typing import Iterable, List
 
 
 @dataclass
@@ -12,21 +14,45 @@ class Elf:
         return sum(self.calories)
 
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        blob_by_elf = f.read().split("\n\n")
-
-    elves = [
+def top_totals(lines: Iterable[str], k: int = 3) -> List[int]:
+    """Largest ``k`` elf totals (largest first), keeping only ``k`` in memory."""
+    heap: List[int] = []
+    total = None
+    # trailing blank line flushes the last elf
+    for line in chain(lines, [""]):
+        line = line.strip()
+        if line:
+            total = (total or 0) + int(line)
+            continue
+        if total is None:
+            continue
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+        total = None
+    return sorted(heap, reverse=True)
+
+
+def parse(text: str) -> List[Elf]:
+    return [
         Elf(id=i, calories=[int(s) for s in txt.split()])
-        for i, txt in enumerate(blob_by_elf)
+        for i, txt in enumerate(text.strip().split("\n\n"))
     ]
 
-    elves.sort(key=lambda e: e.total)
-    max_elf = elves[-1]
-    print(max_elf)
-    print(max_elf.total)
 
-    top_3 = elves[-3:]
-    print(len(top_3))
-    print(top_3)
-    print(sum([e.total for e in top_3]))
+def part1(elves: List[Elf]) -> int:
+    return max(e.total for e in elves)
+
+
+def part2(elves: List[Elf], k: int = 3) -> int:
+    return sum(heapq.nlargest(k, [e.total for e in elves]))
+
+
+if __name__ == "__main__":
+    # stream the file line by line rather than holding every elf in memory
+    with open("input.txt", "r") as f:
+        top_3 = top_totals(f, k=3)
+
+    print(top_3[0])
+    print(sum(top_3))
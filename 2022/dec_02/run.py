@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import BinaryIO, List
 
 
 class Outcome(Enum):
@@ -33,6 +34,15 @@ class GameMove(Enum):
         }.get(s.lower())
 
 
+# key beats value
+WINNING_PLAY = {
+    GameMove.ROCK: GameMove.SCISSORS,
+    GameMove.PAPER: GameMove.ROCK,
+    GameMove.SCISSORS: GameMove.PAPER,
+}
+LOSING_PLAY = {v: k for k, v in WINNING_PLAY.items()}
+
+
 @dataclass
 class Round:
     opponent: GameMove
@@ -41,43 +51,89 @@ class Round:
 
     @property
     def score(self) -> int:
-        winning_play = {
-            GameMove.ROCK: GameMove.SCISSORS,
-            GameMove.PAPER: GameMove.ROCK,
-            GameMove.SCISSORS: GameMove.PAPER,
-        }
-
         if self.outcome == Outcome.DRAW:
             move = self.opponent
         elif self.outcome == Outcome.LOSS:
-            move = winning_play.get(self.opponent)
+            move = WINNING_PLAY.get(self.opponent)
         else:
-            move = {v: k for k, v in winning_play.items()}.get(self.opponent)
-
-        # if self.move == self.opponent:
-        #     outcome = Outcome.DRAW
-        # else:
-        #     outcome = (
-        #         Outcome.WIN
-        #         if winning_play.get(self.move) == self.opponent
-        #         else Outcome.LOSS
-        #     )
+            move = LOSING_PLAY.get(self.opponent)
 
         return int(move.value) + int(self.outcome.value)
 
+    @classmethod
+    def from_moves(cls, opponent: GameMove, move: GameMove):
+        if move == opponent:
+            outcome = Outcome.DRAW
+        elif WINNING_PLAY.get(move) == opponent:
+            outcome = Outcome.WIN
+        else:
+            outcome = Outcome.LOSS
+        return cls(opponent=opponent, outcome=outcome)
+
+
+# Score of a round indexed by [opponent][second column], with both columns as 0-2
+MOVES = list(GameMove)
+OUTCOMES = list(Outcome)
+SCORES_AS_MOVE = [[Round.from_moves(o, m).score for m in MOVES] for o in MOVES]
+SCORES_AS_OUTCOME = [[Round(o, outcome).score for outcome in OUTCOMES] for o in MOVES]
+
+CHUNK_SIZE = 1 << 26
+
+
+def count_rounds(buf: bytes) -> List[List[int]]:
+    """3x3 histogram of (opponent, second column) pairs found in a raw buffer."""
+    import numpy as np
+
+    data = np.frombuffer(buf, dtype=np.uint8)
+    opponent = data[(data >= ord("A")) & (data <= ord("C"))].astype(np.intp)
+    column = data[(data >= ord("X")) & (data <= ord("Z"))].astype(np.intp)
+    assert opponent.shape == column.shape
+    idx = 3 * (opponent - ord("A")) + (column - ord("X"))
+    return np.bincount(idx, minlength=9).reshape(3, 3).tolist()
+
+
+def count_rounds_file(f: BinaryIO, chunk_size: int = CHUNK_SIZE) -> List[List[int]]:
+    """Same as ``count_rounds``, reading the file in chunks of whole lines."""
+    counts = [[0, 0, 0] for _ in range(3)]
+    rest = b""
+    while True:
+        chunk = f.read(chunk_size)
+        buf = rest + chunk
+        if chunk:
+            cut = buf.rfind(b"\n") + 1
+            buf, rest = buf[:cut], buf[cut:]
+        for row, new_row in zip(counts, count_rounds(buf)):
+            for i, n in enumerate(new_row):
+                row[i] += n
+        if not chunk:
+            return counts
+
+
+def total_score(counts: List[List[int]], scores: List[List[int]]) -> int:
+    return sum(
+        n * s
+        for count_row, score_row in zip(counts, scores)
+        for n, s in zip(count_row, score_row)
+    )
+
+
+def parse(text: str) -> List[List[int]]:
+    return count_rounds(text.encode())
+
+
+def part1(counts: List[List[int]]) -> int:
+    # second column is the move to play
+    return total_score(counts, SCORES_AS_MOVE)
+
+
+def part2(counts: List[List[int]]) -> int:
+    # second column is the outcome to aim for
+    return total_score(counts, SCORES_AS_OUTCOME)
+
 
 if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
-
-    rounds = [tuple(s.split()) for s in lines]
-    rounds = [
-        Round(
-            opponent=GameMove.from_str(r[0]),
-            outcome=Outcome.from_str(r[1]),
-        )
-        for r in rounds
-    ]
-    # print(rounds[:5])
-    # print(rounds[0], rounds[0].score)
-    print(sum([round.score for round in rounds]))
+    with open("input.txt", "rb") as f:
+        counts = count_rounds_file(f)
+
+    print(part1(counts))
+    print(part2(counts))
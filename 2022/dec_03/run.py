@@ -1,51 +1,131 @@
+import string
 from dataclasses import dataclass
-from typing import List, Set
+from typing import BinaryIO, List, Tuple
+
+# bit ``p`` of a compartment mask marks an item with priority ``p``
+PRIORITY = {
+    c: i + 1 for i, c in enumerate(string.ascii_lowercase + string.ascii_uppercase)
+}
+CHUNK_SIZE = 1 << 24
 
 
 def priority(s) -> int:
-    alphabet = "abcdefghijklmnopqrstuvwxyz"
-    alphabet = alphabet + alphabet.upper()
-    return alphabet.index(s) + 1
+    return PRIORITY[s]
+
+
+def item_mask(items: str) -> int:
+    mask = 0
+    for c in items:
+        mask |= 1 << PRIORITY[c]
+    return mask
 
 
-def overlap(sets: List[Set[str]]) -> str:
-    common = sets[0]
-    for set in sets[1:]:
-        common = common.intersection(set)
-    assert len(common) == 1, sets
+def overlap(masks: List[int]) -> int:
+    """Priority of the single item common to all masks."""
+    common = masks[0]
+    for mask in masks[1:]:
+        common &= mask
+    assert common and common & (common - 1) == 0, masks
 
-    return list(common)[0]
+    return common.bit_length() - 1
 
 
 @dataclass
 class Sack:
-    side_a: Set[str]
-    side_b: Set[str]
+    side_a: int
+    side_b: int
 
     @property
-    def combined(self) -> Set[str]:
+    def combined(self) -> int:
         return self.side_a | self.side_b
 
     @classmethod
     def from_str(cls, s: str):
-        side_a = set(s[: len(s) // 2])
-        side_b = set(s[len(s) // 2 :])
+        side_a = item_mask(s[: len(s) // 2])
+        side_b = item_mask(s[len(s) // 2 :])
         return cls(side_a=side_a, side_b=side_b)
 
     @property
-    def common(self) -> str:
+    def common(self) -> int:
         return overlap([self.side_a, self.side_b])
 
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
+def batch_priorities(buf: bytes) -> Tuple[int, int]:
+    """Both answers for a raw buffer of whole 3-sack groups, using numpy masks."""
+    import numpy as np
+
+    bits = np.zeros(256, dtype=np.uint64)
+    for c, p in PRIORITY.items():
+        bits[ord(c)] = 1 << p
+
+    data = np.frombuffer(buf, dtype=np.uint8)
+    data = data[data != ord("\r")]
+    if not len(data) or data[-1] != ord("\n"):
+        data = np.append(data, np.uint8(ord("\n")))
+    ends = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    mids = starts + (ends - starts) // 2
+
+    # newlines map to 0, so each side can run up to the next boundary
+    masks = np.bitwise_or.reduceat(bits[data], np.stack([starts, mids], 1).ravel())
+    side_a, side_b = masks[0::2], masks[1::2]
+
+    def priorities(common: np.ndarray) -> np.ndarray:
+        # single set bits, exact as float64 for all 52 priorities
+        return np.log2(common.astype(np.float64)).astype(np.int64)
+
+    part_1 = priorities(side_a & side_b).sum()
+    badges = np.bitwise_and.reduce((side_a | side_b).reshape(-1, 3), axis=1)
+    return int(part_1), int(priorities(badges).sum())
 
-    sacks = [Sack.from_str(s.strip()) for s in lines]
 
-    print(sum([priority(s.common) for s in sacks]))
+def batch_priorities_file(f: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Tuple[int, int]:
+    """``batch_priorities`` over a file, read in chunks of whole groups."""
+    part_1, part_2 = 0, 0
+    rest = b""
+    while True:
+        chunk = f.read(chunk_size)
+        buf = rest + chunk
+        if chunk:
+            cut = 0
+            n_lines = 0
+            idx = buf.find(b"\n")
+            while idx >= 0:
+                n_lines += 1
+                if n_lines % 3 == 0:
+                    cut = idx + 1
+                idx = buf.find(b"\n", idx + 1)
+            buf, rest = buf[:cut], buf[cut:]
+        if buf.strip():
+            a, b = batch_priorities(buf)
+            part_1 += a
+            part_2 += b
+        if not chunk:
+            return part_1, part_2
+
+
+def parse(text: str) -> List[Sack]:
+    return [Sack.from_str(s.strip()) for s in text.splitlines() if s.strip()]
+
+
+def part1(sacks: List[Sack]) -> int:
+    return sum([s.common for s in sacks])
+
+
+def part2(sacks: List[Sack]) -> int:
+    return sum(
+        [
+            overlap([s.combined for s in sacks[i : i + 3]])
+            for i in range(0, len(sacks), 3)
+        ]
+    )
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        sacks = parse(f.read())
 
-    items = [
-        overlap([s.combined for s in sacks[i : i + 3]]) for i in range(0, len(sacks), 3)
-    ]
-    print(sum([priority(s) for s in items]))
+    print(part1(sacks))
+    print(part2(sacks))
@@ -1,11 +1,13 @@
+import re
 from dataclasses import dataclass
-from itertools import combinations, permutations
-from typing import List, Set
+from typing import List, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class Elf:
-    tasks: Set[int]
+    # closed interval of section ids
+    start: int
+    end: int
 
 
 @dataclass
@@ -14,35 +16,65 @@ class Group:
 
 
 def overlap(g: Group) -> bool:
-    for elf_a, elf_b in combinations(g.elves, 2):
-        if elf_a.tasks.intersection(elf_b.tasks):
+    # sweep by start, any elf starting before an earlier one ended overlaps it
+    max_end = None
+    for elf in sorted(g.elves, key=lambda e: e.start):
+        if max_end is not None and elf.start <= max_end:
             return True
+        max_end = elf.end if max_end is None else max(max_end, elf.end)
     return False
 
 
 def complete_overlap(g: Group) -> bool:
-    for elf_a, elf_b in permutations(g.elves, 2):
-        if not (elf_a.tasks - elf_b.tasks):
+    # by start (widest first on ties), an elf is contained by an earlier one
+    # exactly when it ends no later than the furthest end seen so far
+    max_end = None
+    for elf in sorted(g.elves, key=lambda e: (e.start, -e.end)):
+        if max_end is not None and elf.end <= max_end:
             return True
+        max_end = elf.end if max_end is None else max(max_end, elf.end)
     return False
 
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
+def parse_pairs(text: str):
+    """(n, 4) array of ``a-b,c-d`` bounds, for inputs of two-elf groups."""
+    import numpy as np
+
+    return np.array(re.findall(r"\d+", text), dtype=np.int64).reshape(-1, 4)
+
+
+def pair_counts(bounds) -> Tuple[int, int]:
+    """Number of complete and partial overlaps across all pairs at once."""
+    a, b, c, d = bounds.T
+    complete = ((a <= c) & (d <= b)) | ((c <= a) & (b <= d))
+    partial = (a <= d) & (c <= b)
+    return int(complete.sum()), int(partial.sum())
+
 
-    groups = [
+def parse(text: str) -> List[Group]:
+    return [
         Group(
             elves=[
-                Elf(tasks=set(range(int(s.split("-")[0]), int(s.split("-")[-1]) + 1)))
+                Elf(start=int(s.split("-")[0]), end=int(s.split("-")[-1]))
                 for s in line.strip().split(",")
             ]
         )
-        for line in lines
+        for line in text.splitlines()
+        if line.strip()
     ]
 
-    print(len(groups))
 
-    print(len([g for g in groups if overlap(g)]))
-    # print(lines[0])
-    # print(groups[0].elves)
+def part1(groups: List[Group]) -> int:
+    return len([g for g in groups if complete_overlap(g)])
+
+
+def part2(groups: List[Group]) -> int:
+    return len([g for g in groups if overlap(g)])
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        groups = parse(f.read())
+
+    print(part1(groups))
+    print(part2(groups))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
 
 @dataclass
@@ -7,32 +7,71 @@ class Stacks:
     stacks: List[List[str]]
 
     def move_9000(self, n: int, src: int, dst: int) -> None:
-        for _ in range(n):
-            self.stacks[dst].append(self.stacks[src].pop())
+        # crates come off one at a time, so they land in reverse order
+        src_stack = self.stacks[src]
+        self.stacks[dst].extend(reversed(src_stack[len(src_stack) - n :]))
+        del src_stack[len(src_stack) - n :]
 
     def move_9001(self, n: int, src: int, dst: int) -> None:
-        move = []
-        for _ in range(n):
-            move.insert(0, self.stacks[src].pop())
-        self.stacks[dst] += move
+        src_stack = self.stacks[src]
+        self.stacks[dst].extend(src_stack[len(src_stack) - n :])
+        del src_stack[len(src_stack) - n :]
 
+    @property
+    def tops(self) -> str:
+        return "".join([st[-1] for st in self.stacks if st])
+
+
+@dataclass(frozen=True)
+class Move:
+    n: int
+    src: int
+    dst: int
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
 
-    stacks = [[] for _ in range(9)]
+def parse(text: str) -> Tuple[List[List[str]], List[Move]]:
+    lines = text.splitlines()
+
+    # the header ends with the row of stack numbers, e.g. " 1   2   3 "
+    n_rows = next(i for i, line in enumerate(lines) if line.strip()[:1].isdigit())
+    n_stacks = len(lines[n_rows].split())
+
+    stacks = [[] for _ in range(n_stacks)]
     for i, stack in enumerate(stacks):
-        for line in lines[:8][::-1]:
-            char = line[i * 4 + 1].strip()
+        for line in lines[:n_rows][::-1]:
+            char = line[i * 4 + 1 : i * 4 + 2].strip()
             if char:
                 stack.append(char)
 
-    stax = Stacks(stacks=stacks)
-
-    for line in lines[10:]:
+    moves = []
+    for line in lines[n_rows + 1 :]:
         toks = line.strip().split()
-        stax.move_9001(n=int(toks[1]), src=int(toks[3]) - 1, dst=int(toks[-1]) - 1)
+        if toks:
+            moves.append(
+                Move(n=int(toks[1]), src=int(toks[3]) - 1, dst=int(toks[-1]) - 1)
+            )
+    return stacks, moves
+
+
+def part1(model: Tuple[List[List[str]], List[Move]]) -> str:
+    stacks, moves = model
+    stax = Stacks(stacks=[list(st) for st in stacks])
+    for m in moves:
+        stax.move_9000(n=m.n, src=m.src, dst=m.dst)
+    return stax.tops
+
+
+def part2(model: Tuple[List[List[str]], List[Move]]) -> str:
+    stacks, moves = model
+    stax = Stacks(stacks=[list(st) for st in stacks])
+    for m in moves:
+        stax.move_9001(n=m.n, src=m.src, dst=m.dst)
+    return stax.tops
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        model = parse(f.read())
 
-    print(stax.stacks)
-    print("".join([st[-1] for st in stax.stacks]))
+    print(part1(model))
+    print(part2(model))
@@ -1,10 +1,67 @@
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        text = f.read().strip()
+from typing import BinaryIO, Dict, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+def find_markers(chunks: Iterable[bytes], sizes: Iterable[int]) -> Dict[int, int]:
+    """Characters consumed before each window of ``n`` distinct characters ends.
+
+    Every window size is tracked in the same pass with a per-character count,
+    and the stream is only read until the last marker is found.
+    """
+    pending = set(sizes)
+    found = {n: -1 for n in pending}
+    width = max(pending, default=0)
+    # the last ``width`` characters, indexed by position % width
+    window = bytearray(width)
+    counts = {n: [0] * 256 for n in pending}
+    distinct = {n: 0 for n in pending}
+
+    i = 0
+    for chunk in chunks:
+        for c in chunk:
+            if not pending:
+                return found
+            if c in b" \t\r\n":
+                continue
+            for n in list(pending):
+                count = counts[n]
+                if i >= n:
+                    old = window[(i - n) % width]
+                    count[old] -= 1
+                    if count[old] == 0:
+                        distinct[n] -= 1
+                if count[c] == 0:
+                    distinct[n] += 1
+                count[c] += 1
+                if distinct[n] == n:
+                    found[n] = i + 1
+                    pending.remove(n)
+            window[i % width] = c
+            i += 1
+    return found
+
+
+def read_chunks(f: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    return iter(lambda: f.read(chunk_size), b"")
 
-    starts = []
-    for i in range(14, len(text)):
-        if len(set(text[i - 14 : i])) == 14:
-            starts.append(i)
 
-    print(starts[:5])
+def parse(text: str) -> str:
+    return text.strip()
+
+
+def part1(text: str) -> int:
+    return find_markers([text.encode()], [4])[4]
+
+
+def part2(text: str) -> int:
+    return find_markers([text.encode()], [14])[14]
+
+
+if __name__ == "__main__":
+    # both markers in one pass over the stream
+    with open("input.txt", "rb") as f:
+        markers = find_markers(read_chunks(f), [4, 14])
+
+    print(markers[4])
+    print(markers[14])
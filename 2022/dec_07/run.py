@@ -1,42 +1,114 @@
-from pathlib import Path
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+FS_SIZE = 70000000
+REQUIRED = 30000000
+
+
+@dataclass(eq=False)
+class Directory:
+    name: str
+    parent: Optional["Directory"] = None
+    children: Dict[str, "Directory"] = field(default_factory=dict)
+    # total size of everything below, and how much of it the parent has seen
+    size: int = 0
+    reported: int = 0
+
+    @property
+    def path(self) -> str:
+        if self.parent is None:
+            return "/"
+        return self.parent.path.rstrip("/") + "/" + self.name
+
+    def child(self, name: str) -> "Directory":
+        if name not in self.children:
+            self.children[name] = Directory(name=name, parent=self)
+        return self.children[name]
+
+    def roll_up(self) -> None:
+        if self.parent is not None:
+            self.parent.size += self.size - self.reported
+        self.reported = self.size
+
+
+@dataclass
+class FileSystem:
+    root: Directory = field(default_factory=lambda: Directory(name="/"))
+    # every non-empty directory size, ascending, plus running totals of that list
+    sorted_sizes: List[int] = field(default_factory=list)
+    cumulative: List[int] = field(default_factory=list)
+
+    def directories(self) -> List[Directory]:
+        result, to_visit = [], [self.root]
+        while to_visit:
+            d = to_visit.pop()
+            result.append(d)
+            to_visit += d.children.values()
+        return result
+
+    def index(self) -> None:
+        # directories with no files anywhere below don't count, as if never seen
+        self.sorted_sizes = sorted(d.size for d in self.directories() if d.size)
+        self.cumulative = list(accumulate(self.sorted_sizes))
+
+    def total_at_most(self, n: int) -> int:
+        """Sum of the sizes of all directories no bigger than ``n``."""
+        i = bisect_right(self.sorted_sizes, n)
+        return self.cumulative[i - 1] if i else 0
+
+    def smallest_at_least(self, n: int) -> int:
+        """Size of the smallest directory at least ``n`` big."""
+        return self.sorted_sizes[bisect_left(self.sorted_sizes, n)]
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
-        # text = f.read().strip()
 
-    results = {}
-    cwd = None
-    # Group lines from the same directory
-    for line in lines:
+def parse(text: str) -> FileSystem:
+    fs = FileSystem()
+    cwd = fs.root
+
+    def climb_to_root(d: Directory) -> None:
+        while d.parent is not None:
+            d.roll_up()
+            d = d.parent
+
+    # Sizes only travel one level, when leaving a directory, so every line is O(1)
+    for line in text.splitlines():
         if line.startswith("$ cd"):
             dir_name = line.strip()[5:].strip()
             if dir_name == "/":
-                cwd = Path(dir_name)
+                climb_to_root(cwd)
+                cwd = fs.root
             elif dir_name == "..":
+                cwd.roll_up()
                 cwd = cwd.parent
             else:
-                cwd = cwd / dir_name
+                cwd = cwd.child(dir_name)
             continue
-        if line.startswith("$ ls") or line.startswith("dir"):
+        if line.startswith("$ ls") or not line.strip():
             continue
-        fsize = int(line.split()[0])
-        x = cwd
-        results[str(x.absolute())] = results.get(str(x.absolute()), 0) + fsize
-        while x != x.parent:
-            x = x.parent
-            results[str(x.absolute())] = results.get(str(x.absolute()), 0) + fsize
-
-    valid = {k: v for k, v in results.items() if v <= 100000}
-    print(valid.keys())
-    print(sum(valid.values()))
-
-    FS_SIZE = 70000000
-    REQUIRED = 30000000
-    delta = REQUIRED - (FS_SIZE - results["/"])
-    print(delta)
-    valid = sorted(
-        [(k, v) for k, v in results.items() if v >= delta], key=lambda x: x[1]
-    )
-    print(valid)
-    print(valid[0])
+        if line.startswith("dir"):
+            cwd.child(line.split()[1])
+            continue
+        cwd.size += int(line.split()[0])
+
+    climb_to_root(cwd)
+    fs.index()
+    return fs
+
+
+def part1(fs: FileSystem) -> int:
+    return fs.total_at_most(100000)
+
+
+def part2(fs: FileSystem) -> int:
+    delta = REQUIRED - (FS_SIZE - fs.root.size)
+    return fs.smallest_at_least(delta)
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        fs = parse(f.read())
+
+    print(part1(fs))
+    print(part2(fs))
@@ -0,0 +1,47 @@
+"""Times the vectorised visibility/scenic kernels against the per-tree loops.
+
+python bench_kernels.py --sizes 50 100 1000 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from run import (
+    scenic_scores,
+    scenic_scores_reference,
+    visible_trees,
+    visible_trees_reference,
+)
+
+# the loops are O(n^3), don't bother past this
+REFERENCE_MAX_SIZE = 200
+
+
+def timed(fn, trees):
+    start = time.perf_counter()
+    result = fn(trees)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[50, 100, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        trees = rng.integers(0, 10, size=(size, size), dtype=np.int8)
+        for name, fast, slow in [
+            ("visible", visible_trees, visible_trees_reference),
+            ("scenic", scenic_scores, scenic_scores_reference),
+        ]:
+            result, fast_s = timed(fast, trees)
+            s = f"{name:<8} {size:>6} vectorised {fast_s * 1000:>10.2f}ms"
+            if size <= REFERENCE_MAX_SIZE:
+                expected, slow_s = timed(slow, trees)
+                assert np.array_equal(result, expected)
+                s += f" loops {slow_s * 1000:>10.2f}ms x{slow_s / fast_s:.0f}"
+            print(s)
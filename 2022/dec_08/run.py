@@ -2,14 +2,70 @@ from functools import reduce
 import operator
 import numpy as np
 
-if __name__ == "__main__":
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
 
-    trees = np.asarray([[int(c) for c in l.strip()] for l in lines])
-    print(trees.shape)
-    print(trees[:5, :5])
+def parse(text: str) -> np.ndarray:
+    rows = text.split()
+    return (
+        np.frombuffer("".join(rows).encode(), dtype=np.uint8).reshape(len(rows), -1)
+        - ord("0")
+    ).astype(np.int8)
+
+
+def visible_from_left(trees: np.ndarray) -> np.ndarray:
+    """Trees taller than everything before them in their row."""
+    tallest = np.maximum.accumulate(trees, axis=1)
+    visible = np.ones(trees.shape, dtype=bool)
+    visible[:, 1:] = trees[:, 1:] > tallest[:, :-1]
+    return visible
+
+
+def visible_along_rows(trees: np.ndarray) -> np.ndarray:
+    visible = visible_from_left(trees)
+    visible |= visible_from_left(trees[:, ::-1])[:, ::-1]
+    return visible
+
+
+def visible_trees(trees: np.ndarray) -> int:
+    # the running max is only quick along contiguous rows, so transpose once
+    visible = visible_along_rows(trees)
+    visible |= visible_along_rows(np.ascontiguousarray(trees.T)).T
+    return int(np.count_nonzero(visible))
+
+
+def viewing_distance(trees: np.ndarray) -> np.ndarray:
+    """Number of trees seen looking back up each column, from every tree.
+
+    Heights are single digits, so the monotonic stack of a column collapses
+    into the row of the nearest tree of each height, and a whole row of the
+    forest can be pushed onto every column's stack at once.
+    """
+    n_rows, n_cols = trees.shape
+    dtype = np.int16 if n_rows <= np.iinfo(np.int16).max else np.int32
+    heights = np.arange(int(trees.max()) + 1, dtype=trees.dtype)
+    # nearest[c, h] is the last row in column c holding a tree of height >= h
+    nearest = np.zeros((n_cols, len(heights)), dtype=dtype)
+    offsets = np.arange(n_cols, dtype=np.intp) * len(heights)
+    at = np.empty(n_cols, dtype=np.intp)
+    taller = np.empty(nearest.shape, dtype=bool)
+    distance = np.empty(trees.shape, dtype=dtype)
+    for i, row in enumerate(trees):
+        np.add(offsets, row, out=at)
+        np.subtract(i, nearest.take(at), out=distance[i], casting="unsafe")
+        np.greater_equal(row[:, None], heights, out=taller)
+        np.copyto(nearest, i, where=taller, casting="unsafe")
+    return distance
+
 
+def scenic_scores(trees: np.ndarray) -> np.ndarray:
+    across = np.ascontiguousarray(trees.T)
+    scores = viewing_distance(trees).astype(np.int64)
+    scores *= viewing_distance(trees[::-1])[::-1]
+    scores *= viewing_distance(across).T
+    scores *= viewing_distance(across[::-1])[::-1].T
+    return scores
+
+
+def visible_trees_reference(trees: np.ndarray) -> int:
     visible = set()
 
     for i in range(trees.shape[0]):
@@ -25,9 +81,11 @@ if __name__ == "__main__":
             ):
                 visible.add((i, j))
 
-    print(len(visible))
+    return len(visible)
+
 
-    scenic_scores = np.zeros_like(trees)
+def scenic_scores_reference(trees: np.ndarray) -> np.ndarray:
+    scenic_scores = np.zeros(trees.shape, dtype=np.int64)
     for i in range(trees.shape[0]):
         for j, v in enumerate(trees[i]):
             # left, right, top, bottom
@@ -49,6 +107,20 @@ if __name__ == "__main__":
                 if trees[i, x] >= v:
                     break
             scenic_scores[i, j] = reduce(operator.mul, scalars, 1)
-    print(scenic_scores[:5, :5])
+    return scenic_scores
+
+
+def part1(trees: np.ndarray) -> int:
+    return visible_trees(trees)
+
+
+def part2(trees: np.ndarray) -> int:
+    return int(np.amax(scenic_scores(trees)))
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        trees = parse(f.read())
 
-    print(np.amax(scenic_scores))
+    print(part1(trees))
+    print(part2(trees))
@@ -1,94 +1,78 @@
-from dataclasses import dataclass
-from typing import List, Tuple
-import numpy as np
+from typing import Dict, List, Tuple
 
+DIRECTIONS = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+# visited positions are packed into a single int, x in the high 32 bits
+KEY_OFFSET = 1 << 31
 
-@dataclass(frozen=True)
-class Point:
-    x: int
-    y: int
 
-    def add(self, other):
-        return Point(self.x + other.x, self.y + other.y)
+def pack(x: int, y: int) -> int:
+    return ((x + KEY_OFFSET) << 32) | (y + KEY_OFFSET)
 
 
-def parse_moves(line: str) -> List:
+def parse_move(line: str) -> Tuple[int, int, int]:
     direction, count = line.strip().split()
-    match direction:
-        case "R":
-            return int(count) * [Point(1, 0)]
-        case "L":
-            return int(count) * [Point(-1, 0)]
-        case "U":
-            return int(count) * [Point(0, 1)]
-        case "D":
-            return int(count) * [Point(0, -1)]
-        case _:
-            raise ValueError(f"Invalid input direction: {direction}")
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Invalid input direction: {direction}")
+    dx, dy = DIRECTIONS[direction]
+    return dx, dy, int(count)
 
 
-def calculate_tail(head: Point, tail: Point) -> Point:
-    dx = head.x - tail.x
-    dy = head.y - tail.y
+def simulate_many(
+    moves: List[Tuple[int, int, int]], knot_counts: List[int]
+) -> Dict[int, int]:
+    """Number of positions visited by the tail of a rope of each length.
 
-    if abs(dx) > 1 or abs(dy) > 1:
-        change_x = 1 if dx >= 1 else -1 if dx <= -1 else 0
-        change_y = 1 if dy >= 1 else -1 if dy <= -1 else 0
-        return tail.add(Point(change_x, change_y))
+    The tail of a shorter rope follows exactly the same path as the matching
+    knot of a longer one, so a single rope of the longest length is simulated.
+    """
+    knot_counts = sorted(set(knot_counts))
+    n_knots = knot_counts[-1]
+    xs = [0] * n_knots
+    ys = [0] * n_knots
+    visited = {k: {pack(0, 0)} for k in knot_counts}
 
-    return tail
+    for dx, dy, count in moves:
+        for _ in range(count):
+            xs[0] += dx
+            ys[0] += dy
+            # once a knot stays put, so does the rest of the rope
+            moved = 1
+            while moved < n_knots:
+                ddx = xs[moved - 1] - xs[moved]
+                ddy = ys[moved - 1] - ys[moved]
+                if -1 <= ddx <= 1 and -1 <= ddy <= 1:
+                    break
+                xs[moved] += (ddx > 0) - (ddx < 0)
+                ys[moved] += (ddy > 0) - (ddy < 0)
+                moved += 1
+            for k in knot_counts:
+                if k > moved:
+                    break
+                visited[k].add(pack(xs[k - 1], ys[k - 1]))
 
+    return {k: len(v) for k, v in visited.items()}
 
-@dataclass
-class Chain:
-    nodes: List[Point]
 
-    def apply(self, move: Point):
-        self.nodes[0] = self.nodes[0].add(move)
+def simulate(moves: List[Tuple[int, int, int]], n_knots: int) -> int:
+    return simulate_many(moves, [n_knots])[n_knots]
 
-        for i in range(len(self.nodes) - 1):
-            self.nodes[i + 1] = calculate_tail(self.nodes[i], self.nodes[i + 1])
 
-    def viz(self) -> None:
+def parse(text: str) -> List[Tuple[int, int, int]]:
+    return [parse_move(line) for line in text.splitlines() if line.strip()]
 
-        min_x = min([p.x for p in self.nodes])
-        max_x = max([p.x for p in self.nodes])
-        min_y = min([p.y for p in self.nodes])
-        max_y = max([p.y for p in self.nodes])
 
-        chars = ["H"] + [str(i + 1) for i in range(9)]
-        for y in range(min_y, max_y + 1):
-            row = ""
-            for x in range(min_x, max_x + 1):
-                p = Point(x, y)
-                if p in self.nodes:
-                    row += chars[self.nodes.index(p)]
-                else:
-                    row += "."
-            print(row)
+def part1(moves: List[Tuple[int, int, int]]) -> int:
+    return simulate(moves, n_knots=2)
 
 
-if __name__ == "__main__":
-
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
-
-    moves = []
-    for line in lines:
-        moves += parse_moves(line)
+def part2(moves: List[Tuple[int, int, int]]) -> int:
+    return simulate(moves, n_knots=10)
 
-    for n_knots in [2, 10]:
-        chain = Chain(nodes=[Point(0, 0) for _ in range(n_knots)])
 
-        visited = set()
-        visited.add(chain.nodes[-1])
-
-        for move in moves:
-            chain.apply(move)
-            visited.add(chain.nodes[-1])
-            # print("-------------------------")
-            # print(chain.nodes)
-            # chain.viz()
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        moves = parse(f.read())
 
-        print(50 * "#")
-        print(f"Visited: {len(visited)}")
+    visited = simulate_many(moves, [2, 10])
+    print(f"Visited: {visited[2]}")
+    print(f"Visited: {visited[10]}")
@@ -1,5 +1,10 @@
+from array import array
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Iterable, Iterator, List
+
+WIDTH = 40
+HEIGHT = 6
+SAMPLE_CYCLES = range(20, 221, 40)
 
 
 @dataclass(frozen=True)
@@ -9,13 +14,12 @@ class Instruction:
     txt: str
 
 
-def parse_instructions() -> List[Instruction]:
+def parse_program(text: str) -> List[Instruction]:
     instructions = []
-    with open("input.txt", "r") as f:
-        lines = f.readlines()
-
-    for line in lines:
+    for line in text.splitlines():
         parts = line.strip().split()
+        if not parts:
+            continue
         if parts[0] == "noop":
             instructions.append(Instruction(1, 0, line.strip()))
         else:
@@ -23,50 +27,50 @@ def parse_instructions() -> List[Instruction]:
     return instructions
 
 
-def get_cycle_for_pix(x: int, y: int) -> int:
-    w = 40
-    return 1 + y * w + x
+def registers(instructions: Iterable[Instruction]) -> Iterator[int]:
+    """Value of the X register during each cycle, starting at cycle 1."""
+    register = 1
+    for instruction in instructions:
+        for _ in range(instruction.cycles):
+            yield register
+        register += instruction.value
 
 
-def get_pix_for_cycle(cycle: int) -> Tuple[int, int]:
-    h = 6
-    w = 40
-    repeat = h * w
-    cycle = (cycle - 1) % repeat
-    return (cycle % w, cycle // w)
+def trace(instructions: Iterable[Instruction]) -> array:
+    # trace[cycle - 1] is the register during that cycle
+    return array("q", registers(instructions))
 
 
-if __name__ == "__main__":
-    instructions = parse_instructions()
-    # print(instructions[:10])
-
-    total = 0
-    for target in [20, 60, 100, 140, 180, 220]:
-        register = 1
-        cycle = 1
-        for instruction in instructions:
-            # print(f"C: {cycle}\tR: {register}")
-            # print(x.txt)
-            if cycle + instruction.cycles > target:
-                print(
-                    f"Cycle: {cycle}, Target: {target}, Register: {register}, SS: {target * register}"
-                )
-                total += target * register
-                break
-            register += instruction.value
-            cycle += instruction.cycles
-
-    print(total)
+def signal_strength(trace: array, cycles: Iterable[int] = SAMPLE_CYCLES) -> int:
+    return sum(cycle * trace[cycle - 1] for cycle in cycles if cycle <= len(trace))
 
-    register = 1
-    cycle = 1
-    output = [["." for _ in range(40)] for _ in range(6)]
-    for instruction in instructions:
-        for _ in range(instruction.cycles):
-            x, y = get_pix_for_cycle(cycle)
-            output[y][x] = "#" if abs(x - register) <= 1 else "."
-            cycle += 1
-        register += instruction.value
 
-    for line in output:
-        print("".join(line))
+def render(trace: array) -> str:
+    output = [["." for _ in range(WIDTH)] for _ in range(HEIGHT)]
+    frame = WIDTH * HEIGHT
+    # the beam wraps around, so each pixel shows the last cycle that drew it
+    for pixel in range(min(frame, len(trace))):
+        last = pixel + (len(trace) - 1 - pixel) // frame * frame
+        x, y = pixel % WIDTH, pixel // WIDTH
+        output[y][x] = "#" if abs(x - trace[last]) <= 1 else "."
+    return "\n".join(["".join(line) for line in output])
+
+
+def parse(text: str) -> array:
+    return trace(parse_program(text))
+
+
+def part1(trace: array) -> int:
+    return signal_strength(trace)
+
+
+def part2(trace: array) -> str:
+    return render(trace)
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        trace = parse(f.read())
+
+    print(part1(trace))
+    print(part2(trace))
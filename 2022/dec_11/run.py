@@ -1,23 +1,43 @@
-from dataclasses import dataclass
+from collections import deque
+from copy import deepcopy
+from dataclasses import dataclass, field
 import math
-from typing import Callable, List, Tuple
-from tqdm import tqdm
+import operator
+from typing import Callable, Deque, Dict, List, Tuple
+
+OPERATORS = {"+": operator.add, "*": operator.mul}
+
+
+def compile_operation(operation_str: str) -> Callable[[int], int]:
+    """Turns e.g. ``old * 19`` or ``old * old`` into a function of ``old``."""
+    lhs, op, rhs = operation_str.split()
+    if lhs != "old" or op not in OPERATORS:
+        raise ValueError(f"Unsupported operation: {operation_str}")
+    fn = OPERATORS[op]
+    if rhs == "old":
+        return lambda old: fn(old, old)
+    operand = int(rhs)
+    return lambda old: fn(old, operand)
 
 
 @dataclass
 class Monkey:
-    items: List[int]
+    items: Deque[int]
     operation_str: str
     test_divisor: int
     target_if_true: int
     target_if_false: int
     inspection_count: int = 0
+    operation: Callable[[int], int] = field(init=False, repr=False)
 
-    def inspect(self, item: int, relief: bool = True, lcm: int = 0) -> Tuple[int, int]:
-        self.inspection_count += 1
-        worry = self.operation(old=item)
+    def __post_init__(self):
+        self.items = deque(self.items)
+        self.operation = compile_operation(self.operation_str)
+
+    def throw(self, item: int, relief: bool = True, lcm: int = 0) -> Tuple[int, int]:
+        worry = self.operation(item)
         if relief:
-            worry = math.floor(worry / 3)
+            worry //= 3
 
         if lcm:
             worry %= lcm
@@ -28,13 +48,13 @@ class Monkey:
             else self.target_if_false
         )
 
-    def operation(self, old: int) -> int:
-        return eval(self.operation_str)
+    def inspect(self, item: int, relief: bool = True, lcm: int = 0) -> Tuple[int, int]:
+        self.inspection_count += 1
+        return self.throw(item, relief=relief, lcm=lcm)
 
 
-def parse_monkeys(fpath: str) -> List[Monkey]:
-    with open(fpath, "r") as f:
-        lines = f.readlines()
+def parse(text: str) -> List[Monkey]:
+    lines = text.strip().splitlines()
     lines_per_monkey = 7
     n_monkeys = (len(lines) + 1) // lines_per_monkey
     lines_by_monkey = [
@@ -57,29 +77,103 @@ def parse_monkeys(fpath: str) -> List[Monkey]:
     return monkeys
 
 
-def play(rounds: int, relief: bool = True, use_lcm: bool = False) -> int:
-
-    monkeys = parse_monkeys("input.txt")
+def tally(holders: List[int], n_monkeys: int) -> List[int]:
+    counts = [0] * n_monkeys
+    for monkey in holders:
+        counts[monkey] += 1
+    return counts
+
+
+def follow_item(
+    monkeys: List[Monkey], monkey: int, item: int, rounds: int, relief: bool, lcm: int
+) -> List[int]:
+    """Inspections made by each monkey while a single item is passed around.
+
+    Items never interact, so one can be followed on its own. Its state at the
+    start of a round is (holder, worry), and once that repeats the remaining
+    rounds are extrapolated from the cycle.
+    """
+    # every monkey that inspected the item in turn, and where each round starts
+    holders: List[int] = []
+    round_starts: List[int] = []
+    seen: Dict[Tuple[int, int], int] = {}
+    for r in range(rounds):
+        state = (monkey, item)
+        if state in seen:
+            start = round_starts[seen[state]]
+            n_cycles, rest = divmod(rounds - r, r - seen[state])
+            cycle = tally(holders[start:], len(monkeys))
+            partial = tally(
+                holders[start : round_starts[seen[state] + rest]], len(monkeys)
+            )
+            return [
+                c + n_cycles * in_cycle + in_partial
+                for c, in_cycle, in_partial in zip(
+                    tally(holders, len(monkeys)), cycle, partial
+                )
+            ]
+        seen[state] = r
+        round_starts.append(len(holders))
+
+        # thrown to a later monkey, the item is inspected again this round
+        while True:
+            holders.append(monkey)
+            item, target = monkeys[monkey].throw(item, relief=relief, lcm=lcm)
+            passed_on = target > monkey
+            monkey = target
+            if not passed_on:
+                break
+    return tally(holders, len(monkeys))
+
+
+def play(
+    monkeys: List[Monkey],
+    rounds: int,
+    relief: bool = True,
+    use_lcm: bool = False,
+    per_item: bool = False,
+) -> int:
     lcm = math.lcm(*[monkey.test_divisor for monkey in monkeys]) if use_lcm else 0
 
-    for _ in tqdm(range(rounds)):
-        for m in monkeys:
-            while m.items:
-                item, target = m.inspect(m.items.pop(0), relief=relief, lcm=lcm)
-                monkeys[target].items.append(item)
-
-    counts = sorted([m.inspection_count for m in monkeys])
+    if per_item:
+        counts = [0] * len(monkeys)
+        for i, m in enumerate(monkeys):
+            for item in m.items:
+                item_counts = follow_item(monkeys, i, item, rounds, relief, lcm)
+                counts = [a + b for a, b in zip(counts, item_counts)]
+    else:
+        from tqdm import tqdm
+
+        monkeys = deepcopy(monkeys)
+        for _ in tqdm(range(rounds)):
+            for m in monkeys:
+                while m.items:
+                    item, target = m.inspect(m.items.popleft(), relief=relief, lcm=lcm)
+                    monkeys[target].items.append(item)
+        counts = [m.inspection_count for m in monkeys]
+
+    counts = sorted(counts)
     monkey_business = counts[-1] * counts[-2]
     return monkey_business
 
 
-if __name__ == "__main__":
-    monkey_business = play(20, relief=True, use_lcm=False)
-    print(f"Pt 1: {monkey_business}")
+def part1(monkeys: List[Monkey]) -> int:
+    return play(monkeys, 20, relief=True, use_lcm=False)
+
 
-    monkey_business = play(
+def part2(monkeys: List[Monkey], per_item: bool = False) -> int:
+    return play(
+        monkeys,
         10000,
         relief=False,
         use_lcm=True,
+        per_item=per_item,
     )
-    print(f"Pt 2: {monkey_business}")
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        monkeys = parse(f.read())
+
+    print(f"Pt 1: {part1(monkeys)}")
+    print(f"Pt 2: {part2(monkeys)}")
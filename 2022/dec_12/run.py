@@ -1,6 +1,7 @@
+from collections import deque
 from dataclasses import dataclass
 import sys
-from typing import Set, Tuple
+from typing import Iterable, Set, Tuple
 import numpy as np
 
 
@@ -10,9 +11,8 @@ class Point2D:
     y: int
 
 
-def parse_grid(fpath: str) -> Tuple[np.ndarray, Point2D, Point2D]:
-    with open(fpath, "r") as f:
-        lines = f.readlines()
+def parse(text: str) -> Tuple[np.ndarray, Point2D, Point2D]:
+    lines = [l for l in text.splitlines() if l.strip()]
 
     mapping = {c: i for i, c in enumerate("abcdefghijklmnopqrstuvwxyz")}
     start = None
@@ -31,47 +31,64 @@ def parse_grid(fpath: str) -> Tuple[np.ndarray, Point2D, Point2D]:
     return grid, start, goal
 
 
-def search(grid, possible_starts: Set[Point2D], goal) -> int:
+def bfs(
+    grid: np.ndarray, sources: Iterable[Point2D], reverse: bool = False
+) -> np.ndarray:
+    """Steps from the nearest source to every cell, -1 where unreachable.
+
+    Cells are flat ``y * w + x`` indices. Going in ``reverse`` walks every
+    step backwards, so the distances are to the sources instead of from them.
+    """
     h, w = grid.shape[:2]
+    heights = grid.ravel().tolist()
+    dist = [-1] * (h * w)
+    frontier = deque()
+    for p in sources:
+        dist[p.y * w + p.x] = 0
+        frontier.append(p.y * w + p.x)
+
+    while frontier:
+        i = frontier.popleft()
+        next_dist = dist[i] + 1
+        # allowed neighbour heights, one step up at most (down, in reverse)
+        floor = heights[i] - 1 if reverse else -sys.maxsize
+        ceiling = sys.maxsize if reverse else heights[i] + 1
+        x = i % w
+        for n in (
+            i - w if i >= w else -1,
+            i + w if i + w < h * w else -1,
+            i - 1 if x > 0 else -1,
+            i + 1 if x < w - 1 else -1,
+        ):
+            if n >= 0 and dist[n] < 0 and floor <= heights[n] <= ceiling:
+                dist[n] = next_dist
+                frontier.append(n)
+    return np.asarray(dist)
+
+
+def search(grid: np.ndarray, possible_starts: Set[Point2D], goal: Point2D) -> int:
+    dist = bfs(grid, possible_starts)[goal.y * grid.shape[1] + goal.x]
+    return int(dist) if dist >= 0 else sys.maxsize
 
-    visited = set()
-    to_search = {p for p in possible_starts}
-
-    dist = 0
-    while to_search:
-        searching = to_search
-        to_search = set()
-        for p in searching:
-            if p == goal:
-                return dist
-            visited.add(p)
-            curr_height = grid[p.y, p.x]
-            possible_moves = [
-                Point2D(p.x + d, p.y) for d in [-1, 1] if 0 <= p.x + d < w
-            ] + [Point2D(p.x, p.y + d) for d in [-1, 1] if 0 <= p.y + d < h]
-            # check we haven't been here before
-            possible_moves = [m for m in possible_moves if m not in visited]
-            # check the move is valid
-            possible_moves = [
-                m for m in possible_moves if grid[m.y, m.x] <= curr_height + 1
-            ]
-
-            # mark possible next moves for search
-            to_search.update(possible_moves)
-        dist += 1
-
-    return sys.maxsize
+
+def part1(model: Tuple[np.ndarray, Point2D, Point2D]) -> int:
+    grid, start, goal = model
+    return search(grid=grid, possible_starts={start}, goal=goal)
+
+
+def part2(model: Tuple[np.ndarray, Point2D, Point2D]) -> int:
+    grid, _, goal = model
+    # one search back down from the goal covers every possible start
+    dist = bfs(grid, [goal], reverse=True)
+    dist = dist[(grid.ravel() == np.min(grid)) & (dist >= 0)]
+    return int(dist.min()) if dist.size else sys.maxsize
 
 
 if __name__ == "__main__":
-    # grid, start, goal = parse_grid("input.txt")
-    grid, start, goal = parse_grid("test_input.txt")
-    # pt 1
-    dist = search(grid=grid, possible_starts={start}, goal=goal)
-    print(dist)
-
-    # pt 2
-    possible_starts = set([Point2D(x, y) for y, x in np.argwhere(grid == np.min(grid))])
-    # print(possible_starts)
-    dist = search(grid=grid, possible_starts=possible_starts, goal=goal)
-    print(dist)
+    # fpath = "input.txt"
+    fpath = "test_input.txt"
+    with open(fpath, "r") as f:
+        model = parse(f.read())
+
+    print(part1(model))
+    print(part2(model))
@@ -1,61 +1,108 @@
-from typing import List, Union
+from typing import List, Tuple, Union
 import logging
-from functools import cmp_to_key
 
+DIVIDERS = [[[2]], [[6]]]
 
-def calculate_order(
-    a: Union[List, int], b: Union[List, int], indent_str: str = ""
-) -> int:
-    logging.debug(f"{indent_str} Compare {a} vs {b}")
+
+def parse_packet(line: str) -> List:
+    """Parses a packet of nested lists of non-negative integers."""
+    packet = None
+    stack: List[List] = []
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if c.isdigit():
+            j = i + 1
+            while j < len(line) and line[j].isdigit():
+                j += 1
+            if not stack:
+                raise ValueError(f"Malformed packet: {line}")
+            stack[-1].append(int(line[i:j]))
+            i = j
+            continue
+        if c == "[":
+            if packet is not None and not stack:
+                raise ValueError(f"Malformed packet: {line}")
+            child = []
+            if stack:
+                stack[-1].append(child)
+            stack.append(child)
+        elif c == "]":
+            if not stack:
+                raise ValueError(f"Malformed packet: {line}")
+            packet = stack.pop()
+        elif c not in ", \t\n":
+            raise ValueError(f"Malformed packet: {line}")
+        i += 1
+    if stack or packet is None:
+        raise ValueError(f"Malformed packet: {line}")
+    return packet
+
+
+def calculate_order(a: Union[List, int], b: Union[List, int]) -> int:
+    """1 if ``a`` comes before ``b``, -1 if after and 0 if they're equal."""
     # both integers
     if isinstance(a, int) and isinstance(b, int):
-        if a == b:
-            return 0
-        if a < b:
-            logging.debug(
-                f"{indent_str}- Left side is smaller, so inputs are IN THE RIGHT ORDER"
-            )
-            return 1
-        logging.debug(
-            f"{indent_str}- Right side is smaller, so inputs are NOT in the right order"
-        )
-        return -1
+        return (a < b) - (a > b)
     # mixed
-    if isinstance(a, int) and isinstance(b, list):
-        logging.debug(
-            f"f{indent_str}- Mixed types; convert left to [{a}] and retry comparison"
-        )
-        return calculate_order([a], b, indent_str=indent_str + "\t")
-    if isinstance(a, list) and isinstance(b, int):
-        logging.debug(
-            f"{indent_str}- Mixed types; convert right to [{b}] and retry comparison"
-        )
-        return calculate_order(a, [b], indent_str=indent_str + "\t")
+    if isinstance(a, int):
+        a = [a]
+    elif isinstance(b, int):
+        b = [b]
 
     # both lists
-    # logging.debug(f"{indent_str} a={len(a)}, b={len(b)}")
-    for i, pa in enumerate(a):
-        # logging.debug(
-        #     f"{indent_str} idx: {i} Elements -> pa= {pa}, pb={b[i] if i < len(b) else None}"
-        # )
-        if i >= len(b):
-            logging.debug(
-                f"{indent_str}- Right side ran out of items, so inputs are NOT in the right order"
-            )
-            return -1
-
-        pb = b[i]
-        order = calculate_order(pa, pb, indent_str=indent_str + "\t")
-        # logging.debug(f"{indent_str} order found to be {order}")
-        if order == 0:
-            continue
-        return order
-    if len(a) == len(b):
+    for pa, pb in zip(a, b):
+        order = calculate_order(pa, pb)
+        if order:
+            return order
+    return (len(a) < len(b)) - (len(a) > len(b))
+
+
+def depth(packet: Union[List, int]) -> int:
+    if isinstance(packet, int):
         return 0
-    logging.debug(
-        f"{indent_str}- Left side ran out of items, so inputs are IN THE RIGHT ORDER"
-    )
-    return 1
+    return 1 + max((depth(p) for p in packet), default=0)
+
+
+def packet_key(packet: Union[List, int], max_depth: int, level: int = 0) -> Tuple:
+    """A tuple that orders the same way as the packet, among packets no deeper
+    than ``max_depth``.
+
+    An integer compares like a list holding just that integer, so every
+    integer is wrapped until it sits at ``max_depth``, leaving only plain
+    integers to compare at the bottom and only tuples above it.
+    """
+    if level == max_depth:
+        return packet
+    if isinstance(packet, int):
+        return (packet_key(packet, max_depth, level + 1),)
+    return tuple(packet_key(p, max_depth, level + 1) for p in packet)
+
+
+def sort_packets(packets: List) -> List:
+    max_depth = max(depth(p) for p in packets) + 1
+    return sorted(packets, key=lambda p: packet_key(p, max_depth))
+
+
+def parse(text: str) -> List:
+    return [parse_packet(l.strip()) for l in text.splitlines() if l.strip()]
+
+
+def part1(packets: List) -> int:
+    pairs = [packets[i : i + 2] for i in range(0, len(packets), 2)]
+    results = [calculate_order(a, b) for a, b in pairs]
+    ordered_indices = [i + 1 for i, x in enumerate(results) if x > 0]
+    return sum(ordered_indices)
+
+
+def part2(packets: List) -> int:
+    # a divider's index is one more than the number of packets sorted ahead of
+    # it, which includes any packet equal to it
+    decoder_key = 1
+    for i, divider in enumerate(sort_packets(DIVIDERS)):
+        before = sum(calculate_order(p, divider) >= 0 for p in packets)
+        decoder_key *= before + i + 1
+    return decoder_key
 
 
 if __name__ == "__main__":
@@ -63,29 +110,10 @@ if __name__ == "__main__":
     INPUT_FPATH = "input.txt"
     # INPUT_FPATH = "test_input.txt"
     with open(INPUT_FPATH, "r") as f:
-        lines = f.readlines()
-
-    packets = [eval(l.strip()) for l in lines if l.strip()]
+        packets = parse(f.read())
 
     logging.info("Part #1")
-    pairs = [packets[i : i + 2] for i in range(0, len(packets), 2)]
-    # pair_idx = 1
-    # for a, b in pairs:
-    #     logging.debug(f"== Pair {pair_idx} ==")
-    #     logging.debug(f"Result: {calculate_order(a, b)}")
-    #     pair_idx += 1
-    #     logging.debug("\n\n")s
-
-    results = [calculate_order(a, b) for a, b in pairs]
-    ordered_indices = [i + 1 for i, x in enumerate(results) if x > 0]
-    logging.info(ordered_indices)
-    logging.info(sum(ordered_indices))
+    logging.info(part1(packets))
 
     logging.info("Part #2")
-    div_1 = [[2]]
-    div_2 = [[6]]
-    sorted_packets = sorted(
-        packets + [div_1, div_2], key=cmp_to_key(calculate_order), reverse=True
-    )
-    div_idxs = [sorted_packets.index(div_1) + 1, sorted_packets.index(div_2) + 1]
-    logging.info(div_idxs[0] * div_idxs[1])
+    logging.info(part2(packets))
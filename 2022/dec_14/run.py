@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 import numpy as np
 
+EMPTY, ROCK, SAND = 0, 1, 2
+
 
 @dataclass(frozen=True)
 class Point2D:
@@ -57,6 +59,10 @@ class Grid2D:
     sand_entry: Point2D
     contains_floor: bool
     grid: np.ndarray = field(init=False)
+    # grid[0, 0] is this point of the cave
+    origin: Point2D = field(init=False)
+    # (y, x) grid cells the current grain fell through, ending where it is now
+    path: List[Tuple[int, int]] = field(init=False)
 
     def bounding_box(self) -> Tuple[Point2D, Point2D]:
         possible_bounds = {self.sand_entry}
@@ -65,6 +71,8 @@ class Grid2D:
         return bounding_box(all_points=list(possible_bounds))
 
     def __post_init__(self):
+        # don't add the floor to the caller's paths
+        self.rock_paths = list(self.rock_paths)
         self.sand = set()
         min_point, max_point = self.bounding_box()
         new_y = max_point.y + 2
@@ -81,40 +89,85 @@ class Grid2D:
             self.rock_paths.append(floor)
             min_point, max_point = self.bounding_box()
 
-        self.grid = np.zeros((max_point.y + 1, max_point.x + 1))
-        for p in self.rock_points():
-            self.grid[p.y, p.x] = 1
+        self.origin = min_point
+        self.grid = np.zeros(
+            (max_point.y - min_point.y + 1, max_point.x - min_point.x + 1),
+            dtype=np.uint8,
+        )
+        for r in self.rock_paths:
+            for l in r.lines:
+                y0, x0 = self.to_cell(l.start)
+                y1, x1 = self.to_cell(l.end)
+                self.grid[
+                    min(y0, y1) : max(y0, y1) + 1, min(x0, x1) : max(x0, x1) + 1
+                ] = ROCK
+        self.path = [self.to_cell(self.sand_entry)]
+
+    def to_cell(self, p: Point2D) -> Tuple[int, int]:
+        return p.y - self.origin.y, p.x - self.origin.x
 
     def rock_points(self):
         return [p for r in self.rock_paths for p in r.coverage]
 
-    def sand_fall(self, start: Point2D) -> Point2D:
+    def sand_fall(self) -> Optional[Tuple[int, int]]:
+        """Drops a grain, returning the cell it rests in or None if it falls off.
+
+        Everything above the previous grain's resting cell is unchanged, so the
+        new grain picks up its fall from the end of the previous path.
+        """
         h, w = self.grid.shape[:2]
-        for next_p in [
-            # below
-            Point2D(start.x, start.y + 1),
-            # below diag/left
-            Point2D(start.x - 1, start.y + 1),
-            # below diag/right
-            Point2D(start.x + 1, start.y + 1),
-        ]:
+        y, x = self.path[-1]
+        while True:
             # trying to fall off
-            if next_p.y >= h or next_p.x >= w or next_p.x < 0:
+            if y + 1 >= h:
                 assert not self.contains_floor
                 return None
-            if self.grid[next_p.y, next_p.x] == 0:
-                return self.sand_fall(next_p)
-        return start
+            # below, below diag/left, below diag/right
+            for next_x in (x, x - 1, x + 1):
+                if next_x < 0 or next_x >= w:
+                    assert not self.contains_floor
+                    return None
+                if self.grid[y + 1, next_x] == EMPTY:
+                    y, x = y + 1, next_x
+                    self.path.append((y, x))
+                    break
+            else:
+                return y, x
 
     def add_sand(self) -> bool:
-        rest_point = self.sand_fall(self.sand_entry)
-        if rest_point:
-            self.grid[rest_point.y, rest_point.x] = 2
-            if rest_point == self.sand_entry:
-                return False
-            return True
+        if not self.path:
+            # the entry is blocked
+            return False
+        rest_cell = self.sand_fall()
+        if rest_cell:
+            self.grid[rest_cell] = SAND
+            self.path.pop()
+            return bool(self.path)
         return False
 
+    def fill(self) -> int:
+        """Fills the cave with sand, returning how many grains came to rest.
+
+        With a floor below, every cell a grain could fall into from the entry
+        ends up holding sand, so the fill is swept a row at a time instead of
+        simulating each grain.
+        """
+        assert self.contains_floor
+        top, x = self.to_cell(self.sand_entry)
+        reachable = np.zeros(self.grid.shape[1], dtype=bool)
+        reachable[x] = True
+        self.grid[top, x] = SAND
+        n_grains = 1
+        for row in self.grid[top + 1 :]:
+            spread = reachable.copy()
+            spread[1:] |= reachable[:-1]
+            spread[:-1] |= reachable[1:]
+            reachable = spread & (row == EMPTY)
+            row[reachable] = SAND
+            n_grains += int(np.count_nonzero(reachable))
+        self.path = []
+        return n_grains
+
     def display(self):
         min_point, max_point = self.bounding_box()
         x_tick_lines = [
@@ -141,18 +194,15 @@ class Grid2D:
                     "+"
                     if p == self.sand_entry
                     else "."
-                    if self.grid[y, x] == 0
+                    if self.grid[self.to_cell(p)] == EMPTY
                     else "#"
-                    if self.grid[y, x] == 1
+                    if self.grid[self.to_cell(p)] == ROCK
                     else "o"
                 )
             print(s)
 
 
-def parse_input(fpath: str) -> List[Path2D]:
-    with open(fpath, "r") as f:
-        lines = f.readlines()
-
+def parse(text: str) -> List[Path2D]:
     def parse_path(line) -> Path2D:
         parts = line.split("->")
         points = [
@@ -163,38 +213,39 @@ def parse_input(fpath: str) -> List[Path2D]:
             lines=[Line2D(start, end) for start, end in zip(points[:-1], points[1:])]
         )
 
-    return [parse_path(line) for line in lines if line.strip()]
+    return [parse_path(line) for line in text.splitlines() if line.strip()]
+
+
+def part1(rock_paths: List[Path2D]) -> int:
+    grid = Grid2D(
+        rock_paths=rock_paths, sand_entry=Point2D(x=500, y=0), contains_floor=False
+    )
+    i = 0
+    while grid.add_sand():
+        i += 1
+    return i
+
+
+def part2(rock_paths: List[Path2D]) -> int:
+    grid = Grid2D(
+        rock_paths=rock_paths, sand_entry=Point2D(x=500, y=0), contains_floor=True
+    )
+    return grid.fill()
 
 
 if __name__ == "__main__":
     input_fpath = "test_input.txt"
+    with open(input_fpath, "r") as f:
+        rock_paths = parse(f.read())
 
     # pt #1
     print(
         "--------------------------------\n Part #1: \n--------------------------------"
     )
-    rock_paths = parse_input(input_fpath)
-    grid = Grid2D(
-        rock_paths=rock_paths, sand_entry=Point2D(x=500, y=0), contains_floor=False
-    )
-    grid.display()
-
-    i = 0
-    while grid.add_sand():
-        i += 1
-    grid.display()
-    print(f"Number of grains until first falls off: {i}")
+    print(f"Number of grains until first falls off: {part1(rock_paths)}")
 
     # pt #2
     print(
         "--------------------------------\n Part #2: \n--------------------------------"
     )
-    grid = Grid2D(
-        rock_paths=rock_paths, sand_entry=Point2D(x=500, y=0), contains_floor=True
-    )
-
-    i = 1
-    while grid.add_sand():
-        i += 1
-    grid.display()
-    print(f"Number of grains come to rest: {i}")
+    print(f"Number of grains come to rest: {part2(rock_paths)}")
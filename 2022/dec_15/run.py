@@ -1,6 +1,13 @@
 from dataclasses import dataclass
-from typing import List
-from tqdm import tqdm
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+TUNING_MULTIPLIER = 4000000
+# candidate points checked against every sensor at once, bounds the memory used
+CANDIDATE_CHUNK_SIZE = 4096
+# rows handled at once by coverage_counts, each one costs a few words per sensor
+ROW_CHUNK_SIZE = 1 << 12
 
 
 @dataclass(frozen=True)
@@ -89,24 +96,144 @@ class Intervals1D:
         return Intervals1D(intervals=[x for x in intervals if x])
 
 
-def row_coverage(row_y: int, sensors: List[Sensor]) -> Intervals1D:
-    row_coverage_intervals = []
-    for s in sensors:
-        dist_to_row = abs(s.position.y - row_y)
-        # this sensor is too far from the line... it can't tell us anything
-        if dist_to_row > s.dist_to_beacon:
-            continue
-        to_spare = s.dist_to_beacon - dist_to_row
-        row_coverage_intervals.append(
-            Interval1D(a=s.position.x - to_spare, b=s.position.x + to_spare)
-        )
-    return Intervals1D(intervals=Interval1D.merge(row_coverage_intervals))
+def sensor_arrays(sensors: List[Sensor]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sensor x, y and the radius they cover, as int64 arrays."""
+    sx = np.array([s.position.x for s in sensors], dtype=np.int64)
+    sy = np.array([s.position.y for s in sensors], dtype=np.int64)
+    r = np.array([s.dist_to_beacon for s in sensors], dtype=np.int64)
+    return sx, sy, r
+
+
+def row_intervals(
+    sx: np.ndarray, sy: np.ndarray, r: np.ndarray, row_y: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (inclusive) of the disjoint runs of row_y that sensors cover.
+
+    Touching intervals are merged too, so any gap between two runs is real.
+    """
+    spare = r - np.abs(sy - row_y)
+    in_reach = spare >= 0
+    a = (sx - spare)[in_reach]
+    b = (sx + spare)[in_reach]
+    if not len(a):
+        # no sensor reaches this row
+        return a, b
+    order = np.argsort(a, kind="stable")
+    a, b = a[order], b[order]
+    reach = np.maximum.accumulate(b)
+    starts = np.flatnonzero(np.r_[True, a[1:] > reach[:-1] + 1])
+    ends = np.r_[starts[1:] - 1, len(a) - 1]
+    return a[starts], reach[ends]
+
+
+def row_gap(a: np.ndarray, b: np.ndarray, min_x: int, max_x: int) -> Optional[int]:
+    """First x in [min_x, max_x] that none of the runs a..b cover."""
+    inside = (b >= min_x) & (a <= max_x)
+    a, b = a[inside], b[inside]
+    if not len(a) or a[0] > min_x:
+        return min_x
+    if b[0] < max_x:
+        return int(b[0]) + 1
+    return None
 
 
-def parse_input(input_fpath: str) -> List[Sensor]:
-    with open(input_fpath, "r") as f:
-        lines = f.readlines()
-
+def row_coverage(row_y: int, sensors: List[Sensor]) -> Intervals1D:
+    a, b = row_intervals(*sensor_arrays(sensors), row_y=row_y)
+    return Intervals1D(intervals=[Interval1D(a=int(x), b=int(y)) for x, y in zip(a, b)])
+
+
+def coverage_counts(
+    sensors: List[Sensor],
+    rows: Iterable[int],
+    min_x: Optional[int] = None,
+    max_x: Optional[int] = None,
+    chunk_size: int = ROW_CHUNK_SIZE,
+) -> np.ndarray:
+    """Number of cells sensors cover in each of ``rows``, within [min_x, max_x].
+
+    Rows are handled ``chunk_size`` at a time as a (rows, sensors) array of
+    spans, sorted by start. Each span adds whatever it reaches past every span
+    before it, so the union is a running max away.
+    """
+    sx, sy, r = sensor_arrays(sensors)
+    rows = np.asarray(rows, dtype=np.int64)
+    # spans out of reach are moved out of the way, before every real one
+    nowhere = np.iinfo(np.int64).min // 4
+    counts = np.empty(len(rows), dtype=np.int64)
+    for i in range(0, len(rows), chunk_size):
+        spare = r - np.abs(sy - rows[i : i + chunk_size, None])
+        a = np.where(spare >= 0, sx - spare, nowhere + 1)
+        b = np.where(spare >= 0, sx + spare, nowhere)
+        if min_x is not None:
+            np.maximum(a, min_x, out=a)
+        if max_x is not None:
+            np.minimum(b, max_x, out=b)
+        order = np.argsort(a, axis=1)
+        a = np.take_along_axis(a, order, axis=1)
+        b = np.take_along_axis(b, order, axis=1)
+        reach = np.maximum.accumulate(b, axis=1)
+        before = np.empty_like(reach)
+        before[:, 0] = nowhere
+        before[:, 1:] = reach[:, :-1]
+        counts[i : i + chunk_size] = np.maximum(
+            reach - np.maximum(before, a - 1), 0
+        ).sum(axis=1)
+    return counts
+
+
+def boundary_candidates(
+    sx: np.ndarray, sy: np.ndarray, r: np.ndarray, min_p: Point2D, max_p: Point2D
+) -> Iterator[np.ndarray]:
+    """Points in the search area likely to be its only uncovered cell, in
+    chunks of about ``CANDIDATE_CHUNK_SIZE``.
+
+    These are where two sensors' boundaries, the lines x + y = u or x - y = v
+    just out of their reach, cross, where a boundary meets an edge of the area
+    and its corners. That's where the cell usually is, but not always: it can
+    be hemmed in on a diagonal by sensors that stop two cells short of it.
+    """
+    u = np.unique(np.r_[sx + sy - r - 1, sx + sy + r + 1])
+    v = np.unique(np.r_[sx - sy - r - 1, sx - sy + r + 1])
+
+    def in_area(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        inside = (xs >= min_p.x) & (xs <= max_p.x) & (ys >= min_p.y) & (ys <= max_p.y)
+        return np.stack([xs[inside], ys[inside]], axis=1)
+
+    step = max(1, CANDIDATE_CHUNK_SIZE // max(len(v), 1))
+    for i in range(0, len(u), step):
+        uu, vv = np.meshgrid(u[i : i + step], v)
+        uu, vv = uu[(uu + vv) % 2 == 0], vv[(uu + vv) % 2 == 0]
+        yield in_area((uu + vv) // 2, (uu - vv) // 2)
+
+    xs, ys = [], []
+    for edge_x in (min_p.x, max_p.x):
+        xs += [np.full(len(u), edge_x), np.full(len(v), edge_x)]
+        ys += [u - edge_x, edge_x - v]
+    for edge_y in (min_p.y, max_p.y):
+        xs += [u - edge_y, v + edge_y]
+        ys += [np.full(len(u), edge_y), np.full(len(v), edge_y)]
+    xs += [np.array([min_p.x, min_p.x, max_p.x, max_p.x])]
+    ys += [np.array([min_p.y, max_p.y, min_p.y, max_p.y])]
+    yield in_area(np.concatenate(xs), np.concatenate(ys))
+
+
+def uncovered_point(
+    sensors: List[Sensor], min_p: Point2D, max_p: Point2D
+) -> Optional[Point2D]:
+    """The first boundary candidate no sensor covers, if there is one."""
+    sx, sy, r = sensor_arrays(sensors)
+    for candidates in boundary_candidates(sx, sy, r, min_p, max_p):
+        for i in range(0, len(candidates), CANDIDATE_CHUNK_SIZE):
+            chunk = candidates[i : i + CANDIDATE_CHUNK_SIZE]
+            dist = np.abs(chunk[:, :1] - sx) + np.abs(chunk[:, 1:] - sy)
+            uncovered = np.flatnonzero((dist > r).all(axis=1))
+            if len(uncovered):
+                x, y = chunk[uncovered[0]]
+                return Point2D(x=int(x), y=int(y))
+    return None
+
+
+def parse(text: str) -> List[Sensor]:
     def parse_sensor(line: str) -> Sensor:
         parts = line.strip().split()
         return Sensor(
@@ -120,7 +247,58 @@ def parse_input(input_fpath: str) -> List[Sensor]:
             ),
         )
 
-    return [parse_sensor(l) for l in lines]
+    return [parse_sensor(l) for l in text.splitlines() if l.strip()]
+
+
+def beacons_by_row(sensors: List[Sensor]) -> Dict[int, Set[int]]:
+    beacons = set([s.beacon for s in sensors])
+    beacons_x_by_y = {}
+    for b in beacons:
+        if b.y not in beacons_x_by_y:
+            beacons_x_by_y[b.y] = {b.x}
+        else:
+            beacons_x_by_y[b.y].add(b.x)
+    return beacons_x_by_y
+
+
+def part1(sensors: List[Sensor], target_y: int = 2000000) -> int:
+    beacons_x_by_y = beacons_by_row(sensors)
+    a, b = row_intervals(*sensor_arrays(sensors), row_y=target_y)
+    x_beacons = [
+        x for x in beacons_x_by_y.get(target_y, []) if np.any((a <= x) & (x <= b))
+    ]
+    return int(np.sum(b - a + 1)) - len(x_beacons)
+
+
+def part2(
+    sensors: List[Sensor],
+    min_p: Point2D = Point2D(x=0, y=0),
+    max_p: Point2D = Point2D(x=4000000, y=4000000),
+    method: str = "boundary",
+) -> int:
+    if method not in ("boundary", "rows"):
+        raise ValueError(f"Unknown method: {method}")
+
+    if method == "boundary":
+        p = uncovered_point(sensors, min_p=min_p, max_p=max_p)
+        if p:
+            return TUNING_MULTIPLIER * p.x + p.y
+        # not on a boundary crossing after all, scan the rows for it
+
+    width = max_p.x - min_p.x + 1
+    # a few chunks per call, so the search still stops soon after the gap
+    block = 16 * ROW_CHUNK_SIZE
+    for start_y in range(min_p.y, max_p.y + 1, block):
+        rows = np.arange(start_y, min(start_y + block, max_p.y + 1))
+        gaps = np.flatnonzero(
+            coverage_counts(sensors, rows, min_x=min_p.x, max_x=max_p.x) < width
+        )
+        if len(gaps):
+            # this row contains the distress beacon
+            row_y = int(rows[gaps[0]])
+            a, b = row_intervals(*sensor_arrays(sensors), row_y=row_y)
+            return TUNING_MULTIPLIER * row_gap(a, b, min_p.x, max_p.x) + row_y
+    return -1
 
 
 if __name__ == "__main__":
@@ -136,46 +314,14 @@ if __name__ == "__main__":
     # min_p = Point2D(x=0, y=0)
     # max_p = Point2D(x=20, y=20)
 
-    sensors = parse_input(input_fpath=input_fpath)
-    beacons = set([s.beacon for s in sensors])
-    beacons_x_by_y = {}
-    for b in beacons:
-        if b.y not in beacons_x_by_y:
-            beacons_x_by_y[b.y] = {b.x}
-        else:
-            beacons_x_by_y[b.y].add(b.x)
+    with open(input_fpath, "r") as f:
+        sensors = parse(f.read())
 
     print("--------------------------------\nPart #1\n--------------------------------")
-    coverage = row_coverage(row_y=target_y, sensors=sensors)
-    x_beacons = [x for x in beacons_x_by_y.get(target_y, []) if coverage.contains(x)]
     print(
         "Number of spots in row, which CANNOT be a beacon: ",
-        coverage.count - len(x_beacons),
+        part1(sensors, target_y=target_y),
     )
-    # s = ""
-    # for x in range(-4, 27):
-    #     s += "#" if coverage.contains(x) else "."
-    # print(s)
 
     print("--------------------------------\nPart #2\n--------------------------------")
-    search_space = Interval1D(min_p.x, max_p.x)
-    for row_y in tqdm(range(min_p.y, max_p.y + 1)):
-        coverage = row_coverage(row_y=row_y, sensors=sensors).intersection(search_space)
-        x_beacons = [x for x in beacons_x_by_y.get(row_y, []) if coverage.contains(x)]
-
-        if coverage.count != search_space.count:
-            # row_y contains the distress beacon... find it
-            valid = Intervals1D(intervals=[search_space])
-            for interval in coverage.intervals:
-                valid = valid.excluding(interval)
-            print(valid)
-            assert valid.count == 1
-            row_x = valid.intervals[0].a
-            tuning_freq = 4000000 * row_x + row_y
-            print(row_x, row_y, tuning_freq)
-            exit(1)
-
-        # s = ""
-        # for x in range(-4, 27):
-        #     s += "#" if coverage.contains(x) else "."
-        # print(s)
+    print("Tuning frequency: ", part2(sensors, min_p=min_p, max_p=max_p))
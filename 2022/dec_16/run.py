@@ -1,6 +1,6 @@
+from collections import deque
 from dataclasses import dataclass, field
-from functools import cache
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -10,13 +10,12 @@ class Valve:
     tunnels: List[str]
 
 
-def parse_input(fpath: str) -> List[Valve]:
-    with open(fpath, "r") as f:
-        lines = f.readlines()
-
+def parse(text: str) -> List[Valve]:
     valves = []
-    for line in lines:
+    for line in text.splitlines():
         parts = line.strip().split()
+        if not parts:
+            continue
         valves.append(
             Valve(
                 id=parts[1].strip(),
@@ -27,92 +26,321 @@ def parse_input(fpath: str) -> List[Valve]:
     return valves
 
 
-if __name__ == "__main__":
-    fpath = "test_input.txt"
-    valves = parse_input(fpath=fpath)
-    valves_by_id = {v.id: v for v in valves}
+STARTING_BUDGET = 30
+STARTING_VALVE = "AA"
+# opened sets SubsetMax scans in a row rather than splitting further
+SUBSET_LEAF_SIZE = 8
 
-    STARTING_BUDGET = 30
 
-    def pressure_release(valves: Iterable[str]) -> int:
-        return sum([valves_by_id[v].flow_rate for v in valves])
+@dataclass
+class ValveGraph:
+    """Just the valves worth opening, and how far apart they all are."""
 
-    @cache
-    def max_pressure(v: str, open_valves: frozenset[str], budget: int) -> int:
-        # Base - no remaining budget to do anything
-        if budget <= 0:
-            return 0
+    names: List[str]
+    flow_rates: List[int]
+    # minutes to walk from valve i to valve j
+    distances: List[List[int]]
+    # minutes to walk from the starting valve to valve i
+    start_distances: List[int]
+    # valve indices, highest flow rate first
+    by_flow: List[int] = field(init=False)
 
-        options = []
-        # Option - spend 1 minute opening valve
-        if v not in open_valves and valves_by_id[v].flow_rate > 0:
-            options.append(max_pressure(v, open_valves | {v}, budget=budget - 1))
+    def __post_init__(self):
+        self.by_flow = sorted(
+            range(len(self.names)), key=lambda v: self.flow_rates[v], reverse=True
+        )
 
-        # Option [n] - spend 1 minute traveling to another valve
+    def optimistic(self, opened: int, time_left: int) -> int:
+        """More pressure than the closed valves could release in ``time_left``,
+        as if each was two minutes (a step and a minute to open it) past the
+        last, highest flow rate first."""
+        pressure = 0
+        for v in self.by_flow:
+            if opened >> v & 1:
+                continue
+            time_left -= 2
+            if time_left <= 0:
+                break
+            pressure += self.flow_rates[v] * time_left
+        return pressure
+
+
+def tunnel_distances(valves_by_id: Dict[str, Valve], source: str) -> Dict[str, int]:
+    distances = {source: 0}
+    to_visit = deque([source])
+    while to_visit:
+        v = to_visit.popleft()
         for next_v in valves_by_id[v].tunnels:
-            options.append(max_pressure(next_v, open_valves, budget=budget - 1))
+            if next_v not in distances:
+                distances[next_v] = distances[v] + 1
+                to_visit.append(next_v)
+    return distances
 
-        # Start w/ what is released by currently open valves and add the best option
-        return pressure_release(open_valves) + max(options)
 
-    print("-------------------------\nPart #1\n------------------------")
-    print(
-        "Maximum Released Pressure: ",
-        max_pressure(v="AA", open_valves=frozenset(), budget=STARTING_BUDGET),
+def compress(valves: List[Valve], start: str = STARTING_VALVE) -> ValveGraph:
+    valves_by_id = {v.id: v for v in valves}
+    useful = [v for v in valves if v.flow_rate > 0]
+    by_source = {v.id: tunnel_distances(valves_by_id, v.id) for v in useful}
+    from_start = tunnel_distances(valves_by_id, start)
+    return ValveGraph(
+        names=[v.id for v in useful],
+        flow_rates=[v.flow_rate for v in useful],
+        distances=[[by_source[a.id][b.id] for b in useful] for a in useful],
+        start_distances=[from_start[v.id] for v in useful],
     )
 
-    @cache
-    def max_pressure_multi(
-        valve_pair: Tuple[str], open_valves: frozenset[str], budget: int
-    ) -> int:
-        # Base - no remaining budget to do anything
-        if budget <= 0:
-            return 0
-
-        options = []
-
-        # Option - both people open (requires 2 different closed valves)s
-        v1, v2 = valve_pair[:2]
-        if v1 != v2 and v1 not in open_valves and v2 not in open_valves:
-            options.append(
-                max_pressure_multi(
-                    valve_pair=valve_pair,
-                    open_valves=open_valves | set(valve_pair),
-                    budget=budget - 1,
-                )
-            )
 
-        # Option - both people travel
-        v1, v2 = valve_pair[:2]
-        for next_v1 in valves_by_id[v1].tunnels:
-            for next_v2 in valves_by_id[v2].tunnels:
-                options.append(
-                    max_pressure_multi(
-                        tuple(sorted([next_v1, next_v2])),
-                        open_valves,
-                        budget=budget - 1,
-                    )
-                )
-
-        # Option - 1 person opens, 1 person travels
-        for v1, v2 in [valve_pair, valve_pair[::-1]]:
-            if v1 not in open_valves and valves_by_id[v1].flow_rate > 0:
-                for next_v2 in set(valves_by_id[v2].tunnels) - {v1}:
-                    options.append(
-                        max_pressure_multi(
-                            valve_pair=tuple(sorted((v1, next_v2))),
-                            open_valves=open_valves | {v1},
-                            budget=budget - 1,
-                        )
+@dataclass
+class SearchStats:
+    # opening orders extended while building the per-agent tables
+    states_explored: int = 0
+    # distinct opened sets across the per-agent tables
+    subsets: int = 0
+    # entries memoised while sharing valves out between agents, subset lookups
+    # included
+    cache_size: int = 0
+
+
+def add_order(orders: List[Tuple[int, int]], time_left: int, pressure: int) -> None:
+    """Adds an order's (time left, pressure) to ``orders`` unless one of them
+    matches it on both, dropping those it beats on both."""
+    for t, p in orders:
+        if t >= time_left and p >= pressure:
+            return
+    orders[:] = [(t, p) for t, p in orders if t > time_left or p > pressure]
+    orders.append((time_left, pressure))
+
+
+def most_pressure(
+    graph: ValveGraph, budget: int, closed: Optional[int] = None
+) -> Tuple[int, int]:
+    """Most pressure a single agent releases opening only valves in ``closed``
+    (all of them by default), and the set it opens.
+
+    Orders that couldn't beat the best found so far, even optimistically, are
+    cut short.
+    """
+    if closed is None:
+        closed = (1 << len(graph.names)) - 1
+    best = (0, 0)
+
+    def visit(row: List[int], time_left: int, opened: int, pressure: int) -> None:
+        nonlocal best
+        if pressure > best[0]:
+            best = (pressure, opened)
+        for next_v in graph.by_flow:
+            bit = 1 << next_v
+            # walk there, then a minute to open it
+            remaining = time_left - row[next_v] - 1
+            if opened & bit or not closed & bit or remaining <= 0:
+                continue
+            next_pressure = pressure + remaining * graph.flow_rates[next_v]
+            ceiling = graph.optimistic(opened | bit | ~closed, remaining)
+            if next_pressure + ceiling > best[0]:
+                visit(graph.distances[next_v], remaining, opened | bit, next_pressure)
+
+    visit(graph.start_distances, budget, 0, 0)
+    return best
+
+
+def best_per_subset(
+    graph: ValveGraph,
+    budget: int,
+    stats: Optional[SearchStats] = None,
+    floor: int = 0,
+) -> Dict[int, int]:
+    """Most pressure released by opening exactly each set of valves in time,
+    for the sets releasing at least ``floor``.
+
+    Sets are bitmasks over ``graph.names``. Opening orders grow one valve at a
+    time, walking straight to it. Orders that opened the same set and stand at
+    the same valve only differ in time left and pressure, so any beaten on both
+    is never stored, and neither is any that couldn't reach ``floor`` even
+    optimistically. Only the orders of one size and the next are held at once.
+    """
+    n_valves = len(graph.names)
+    best = {0: 0}
+    # opened * n_valves + current valve -> undominated (time left, pressure)
+    frontier = {}
+    for v, flow_rate in enumerate(graph.flow_rates):
+        # walk there, then a minute to open it
+        remaining = budget - graph.start_distances[v] - 1
+        pressure = remaining * flow_rate
+        if remaining > 0 and pressure + graph.optimistic(1 << v, remaining) >= floor:
+            frontier[(1 << v) * n_valves + v] = [(remaining, pressure)]
+    while frontier:
+        layer = {}
+        while frontier:
+            # popped, so the orders are freed as they're extended
+            key, orders = frontier.popitem()
+            opened, v = divmod(key, n_valves)
+            top = max(p for _, p in orders)
+            if top >= floor:
+                best[opened] = max(best.get(opened, 0), top)
+            row = graph.distances[v]
+            for time_left, pressure in orders:
+                if stats is not None:
+                    stats.states_explored += 1
+                for next_v, flow_rate in enumerate(graph.flow_rates):
+                    bit = 1 << next_v
+                    remaining = time_left - row[next_v] - 1
+                    if opened & bit or remaining <= 0:
+                        continue
+                    next_pressure = pressure + remaining * flow_rate
+                    if (
+                        floor
+                        and next_pressure + graph.optimistic(opened | bit, remaining)
+                        < floor
+                    ):
+                        continue
+                    add_order(
+                        layer.setdefault((opened | bit) * n_valves + next_v, []),
+                        remaining,
+                        next_pressure,
                     )
+        frontier = layer
+    if stats is not None:
+        stats.subsets += len(best)
+    return best
+
+
+class SubsetMax:
+    """Most pressure released by opening any subset of a set of valves.
 
-        # Start w/ what is released by currently open valves and add the best option
-        return pressure_release(open_valves) + max(options)
+    The opened sets sit in a tree that splits them on one valve per level,
+    each node holding its best pressure, so a search only walks the branches
+    that fit in the set and could still beat the best found so far.
+    """
+
+    def __init__(self, best: Dict[int, int]):
+        self.by_pressure = sorted(best.items(), key=lambda x: x[1], reverse=True)
+        self.top_bit = max(best).bit_length() - 1
+        self.root = self.split(self.by_pressure, self.top_bit)
+        self.known: Dict[int, int] = {}
+
+    @classmethod
+    def split(cls, by_pressure: List[Tuple[int, int]], bit: int):
+        if len(by_pressure) <= SUBSET_LEAF_SIZE or bit < 0:
+            return by_pressure
+        return (
+            by_pressure[0][1],
+            cls.split([x for x in by_pressure if not x[0] >> bit & 1], bit - 1),
+            cls.split([x for x in by_pressure if x[0] >> bit & 1], bit - 1),
+        )
+
+    def search(self, node, closed: int, bit: int, floor: int) -> int:
+        if isinstance(node, list):
+            for opened, pressure in node:
+                if pressure <= floor:
+                    break
+                if not opened & ~closed:
+                    return pressure
+            return floor
+        top, without, with_bit = node
+        if top <= floor:
+            return floor
+        if closed >> bit & 1:
+            floor = self.search(with_bit, closed, bit - 1, floor)
+        return self.search(without, closed, bit - 1, floor)
+
+    def __call__(self, closed: int, floor: int = 0) -> int:
+        """The most pressure, or just ``floor`` if it's no more than that."""
+        if closed in self.known:
+            return max(self.known[closed], floor)
+        pressure = self.search(self.root, closed, self.top_bit, floor)
+        if pressure > floor:
+            self.known[closed] = pressure
+        return pressure
+
+
+def best_with_agents(
+    graph: ValveGraph, budgets: List[int], stats: Optional[SearchStats] = None
+) -> int:
+    """Most pressure released by agents, with their own budgets, working
+    together and never opening the same valve.
+
+    Each budget's table is solved once, for just the sets that could be part
+    of a plan beating the greedy one. The first agent picks an opened set
+    and the rest share what's left, down to the last agent, who just looks up
+    the best subset of the remaining valves.
+    """
+    n_valves = len(graph.names)
+    # a plan to beat: each agent in turn opening the best of what's left
+    target = 0
+    closed = (1 << n_valves) - 1
+    for budget in budgets:
+        pressure, opened = most_pressure(graph, budget, closed)
+        target += pressure
+        closed &= ~opened
+    alone = {budget: most_pressure(graph, budget)[0] for budget in set(budgets)}
+
+    tables = {}
+    for budget in set(budgets):
+        # the sets of the best plan release at least this much, even with the
+        # other agents each releasing what they could alone
+        floor = target - sum(alone[b] for b in budgets) + alone[budget]
+        best = best_per_subset(graph, budget, stats=stats, floor=max(floor, 0))
+        tables[budget] = SubsetMax(best)
+    withins = [tables[budget] for budget in budgets]
+
+    cache = {}
+
+    def share(agent: int, closed: int, floor: int = 0) -> int:
+        """The most pressure the agents from ``agent`` on release opening the
+        ``closed`` valves, or just ``floor`` if it's no more than that."""
+        if agent == len(budgets) - 1:
+            return withins[agent](closed, floor)
+        if (agent, closed) in cache:
+            return max(cache[(agent, closed)], floor)
+
+        # the agents after this one can't beat their best on their own, and
+        # the last of them is only asked whether it beats what's left to beat
+        def bound(closed: int, floor: int) -> int:
+            others = sum(w(closed) for w in withins[agent + 1 : -1])
+            return others + withins[-1](closed, floor - others)
+
+        result = floor
+        ceiling = bound(closed, floor)
+        for opened, pressure in withins[agent].by_pressure:
+            if pressure + ceiling <= result:
+                break
+            left = closed & ~opened
+            if opened & ~closed or pressure + bound(left, result - pressure) <= result:
+                continue
+            result = max(result, pressure + share(agent + 1, left, result - pressure))
+        if result > floor:
+            cache[(agent, closed)] = result
+        return result
+
+    # the greedy plan is there to fall back on, so only better ones count
+    result = share(0, (1 << n_valves) - 1, target)
+    if stats is not None:
+        stats.cache_size += len(cache) + sum(len(t.known) for t in tables.values())
+    return result
+
+
+def part1(valves: List[Valve], budget: int = STARTING_BUDGET) -> int:
+    return most_pressure(compress(valves), budget)[0]
+
+
+def part2(
+    valves: List[Valve],
+    budget: int = STARTING_BUDGET - 4,
+    stats: Optional[SearchStats] = None,
+) -> int:
+    # you and the elephant
+    return best_with_agents(compress(valves), [budget, budget], stats=stats)
+
+
+if __name__ == "__main__":
+    fpath = "test_input.txt"
+    with open(fpath, "r") as f:
+        valves = parse(f.read())
+
+    print("-------------------------\nPart #1\n------------------------")
+    print("Maximum Released Pressure: ", part1(valves))
 
     print("-------------------------\nPart #2\n------------------------")
-    print(
-        "Maximum Released Pressure: ",
-        max_pressure_multi(
-            valve_pair=("AA", "AA"), open_valves=frozenset(), budget=STARTING_BUDGET - 4
-        ),
-    )
+    stats = SearchStats()
+    print("Maximum Released Pressure: ", part2(valves, stats=stats))
+    print(stats)
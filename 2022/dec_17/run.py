@@ -1,187 +1,308 @@
-from copy import deepcopy
+from collections import OrderedDict
 from dataclasses import dataclass
-from functools import cache
-from typing import List, Tuple
-import numpy as np
-from tqdm import tqdm
-
+import time
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 
 INPUT_FPATH = "input.txt"
 CAVERN_WIDTH = 7
 STARTING_GAP = 3
+# rows of the tower kept in a memoised state, anything below acts as the floor
 TRUNCATE_TOWER = 53
-
-KERNELS = [
-    np.array([[1, 1, 1, 1]], dtype=np.int32),
-    np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]], dtype=np.int32),
-    np.array([[0, 0, 1], [0, 0, 1], [1, 1, 1]], dtype=np.int32),
-    np.array([[1], [1], [1], [1]], dtype=np.int32),
-    np.array([[1, 1], [1, 1]], dtype=np.int32),
+# blocks per memoised call, and results kept per memoised function
+N_PER_STEP = 100_000
+MEMO_SIZE = 1 << 16
+
+# a row is a bitmask with the leftmost column in the highest bit
+LEFT_WALL = 1 << (CAVERN_WIDTH - 1)
+RIGHT_WALL = 1
+# rows of each shape from the bottom up, starting two columns in from the left
+SHAPES = [
+    (0b0011110,),
+    (0b0001000, 0b0011100, 0b0001000),
+    (0b0011100, 0b0000100, 0b0000100),
+    (0b0010000,) * 4,
+    (0b0011000,) * 2,
 ]
-N_KERNELS = len(KERNELS)
-JETS = [1 if c == ">" else -1 for c in open(INPUT_FPATH, "r").read().strip()]
-N_JETS = len(JETS)
-
-
-def empty_row() -> List[int]:
-    return CAVERN_WIDTH * [0]
-
+N_SHAPES = len(SHAPES)
 
-def calc_row_occupation(block: np.ndarray, x: int, block_y: int = -1) -> List[int]:
-    block_row_occupation = empty_row()
-    block_row_occupation[x : x + block.shape[1]] = list(block[block_y, :].flatten())
-    return block_row_occupation
 
-
-def display(
-    rows: List[List[int]], falling_block: np.ndarray = None, blc: Tuple[int, int] = None
-) -> None:
+def display(rows: bytearray) -> None:
     print("-------------------------")
-
-    rows = deepcopy(rows)
-    if falling_block is not None:
-        x, y = blc
-        for i, row_idx in enumerate(range(y, y - falling_block.shape[0], -1)):
-            block_row_occupation = calc_row_occupation(
-                falling_block, x=x, block_y=-(1 + i)
-            )
-            if row_idx < 0:
-                continue
-            rows[row_idx] = [
-                2 if b else a for a, b in zip(rows[row_idx], block_row_occupation)
-            ]
-
-    for row in rows:
+    for row in reversed(rows):
         print(
             "|"
             + "".join(
-                [
-                    "#" if occupied == 1 else "." if occupied == 0 else "@"
-                    for occupied in row
-                ]
+                "#" if row & (LEFT_WALL >> x) else "." for x in range(CAVERN_WIDTH)
             )
             + "|"
         )
-    print("+" + "".join(len(rows[0]) * ["-"]) + "+")
+    print("+" + CAVERN_WIDTH * "-" + "+")
+
 
+def collision(rows: bytearray, shape: Tuple[int, ...], y: int) -> bool:
+    return any(y + i < len(rows) and rows[y + i] & mask for i, mask in enumerate(shape))
 
-def collision(rows: List[List[int]], block: np.ndarray, blc: Tuple[int, int]) -> bool:
-    x, y = blc
-    # Check for collision w/ walls
-    if x < 0 or x > CAVERN_WIDTH - block.shape[1]:
-        return True
 
-    if y >= len(rows):
-        return True
+def push(shape: Tuple[int, ...], jet: int) -> Tuple[int, ...]:
+    # stays put against the walls
+    if jet > 0:
+        if any(mask & RIGHT_WALL for mask in shape):
+            return shape
+        return tuple(mask >> 1 for mask in shape)
+    if any(mask & LEFT_WALL for mask in shape):
+        return shape
+    return tuple(mask << 1 for mask in shape)
 
-    # for each row, check for collision with occupied spaces
-    for i, row_idx in enumerate(range(y, y - block.shape[0], -1)):
-        block_row_occupation = calc_row_occupation(block, x=x, block_y=-(1 + i))
 
-        if row_idx < 0:
+def drop(rows: bytearray, shape_idx: int, jets: List[int], jet_idx: int) -> int:
+    """Drops one rock onto the tower (row 0 at the bottom), returns the next jet."""
+    shape = SHAPES[shape_idx]
+    y = len(rows) + STARTING_GAP
+    while True:
+        pushed = push(shape, jets[jet_idx])
+        jet_idx = (jet_idx + 1) % len(jets)
+        if pushed is not shape and not collision(rows, pushed, y):
+            shape = pushed
+
+        if y == 0 or collision(rows, shape, y - 1):
+            break
+        y -= 1
+
+    for i, mask in enumerate(shape):
+        if y + i < len(rows):
+            rows[y + i] |= mask
+        else:
+            rows.append(mask)
+    return jet_idx
+
+
+def surface(rows: bytearray) -> Tuple[int, ...]:
+    """How far below the top of the tower the highest rock in each column is.
+
+    Only the top ``TRUNCATE_TOWER`` rows are looked at, a column empty all the
+    way down them counts as that deep, so a column that never gets a rock
+    doesn't keep the surface from repeating.
+    """
+    top = rows[-TRUNCATE_TOWER:]
+    depths = []
+    for x in range(CAVERN_WIDTH):
+        bit = LEFT_WALL >> x
+        depth = 0
+        for row in reversed(top):
+            if row & bit:
+                break
+            depth += 1
+        depths.append(depth)
+    return tuple(depths)
+
+
+def tower_height(jets: List[int], n_blocks: int) -> int:
+    """Height of the tower after ``n_blocks`` rocks.
+
+    Once a (jet, shape, surface) state repeats, the tower grows by the same
+    amount every period, so as many whole periods as fit are skipped.
+    """
+    rows = bytearray()
+    jet_idx = 0
+    seen: Dict[Tuple, Tuple[int, int]] = {}
+    skipped_height = None
+    n = 0
+    while n < n_blocks:
+        jet_idx = drop(rows, n % N_SHAPES, jets, jet_idx)
+        n += 1
+        if skipped_height is not None:
+            continue
+
+        key = (jet_idx, n % N_SHAPES, surface(rows))
+        if key not in seen:
+            seen[key] = (n, len(rows))
             continue
+        cycle_start, start_height = seen[key]
+        n_cycles = (n_blocks - n) // (n - cycle_start)
+        skipped_height = n_cycles * (len(rows) - start_height)
+        n += n_cycles * (n - cycle_start)
 
-        if any(a and b for a, b in zip(rows[row_idx], block_row_occupation)):
-            return True
-    return False
+    return len(rows) + (skipped_height or 0)
 
 
 @dataclass(frozen=True)
 class State:
     jet_idx: int
     block_idx: int
-    rows: str
+    # the top of the tower, bottom row first
+    rows: bytes
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class LRUMemo:
+    """Memoises ``fn``, keeping at most ``maxsize`` results (None for no limit)
+    and evicting the least recently used one first.
+
+    ``key`` maps the call's arguments to what is stored, so callers can swap
+    bulky arguments for something more compact.
+    """
+
+    def __init__(
+        self,
+        fn: Callable,
+        maxsize: Optional[int] = MEMO_SIZE,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        self.fn = fn
+        self.maxsize = maxsize
+        self.key = key or (lambda *args: args)
+        self.entries: OrderedDict = OrderedDict()
+        self.stats = MemoStats()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __call__(self, *args) -> Any:
+        key = self.key(*args)
+        if key in self.entries:
+            self.stats.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.stats.misses += 1
+        result = self.fn(*args)
+        self.entries[key] = result
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+        return result
+
+
+def state_key(state: "State", *args) -> Tuple:
+    # the rows as one int, under a leading 1 byte so no row gets lost
+    return (
+        state.jet_idx,
+        state.block_idx,
+        int.from_bytes(b"\x01" + state.rows, "big"),
+        *args,
+    )
 
 
-def str_to_rows(s: str) -> List[List[int]]:
-    return [
-        [int(x) for x in row_s.strip().split(",")] for row_s in s.strip().split("\n")
-    ]
+class Cavern:
+    def __init__(
+        self,
+        jets: List[int],
+        truncate_tower: int = TRUNCATE_TOWER,
+        memo_size: Optional[int] = MEMO_SIZE,
+        memo: Callable[..., LRUMemo] = LRUMemo,
+    ) -> None:
+        self.jets = jets
+        self.truncate_tower = truncate_tower
+        # memoise per cavern, so no state is kept alive between puzzle inputs
+        self.simulate_block = memo(self.simulate_block, memo_size, state_key)
+        self.simulate_blocks = memo(self.simulate_blocks, memo_size, state_key)
+
+    def simulate_block(self, state: State) -> Tuple[int, State]:
+        rows = bytearray(state.rows)
+        jet_idx = drop(rows, state.block_idx, self.jets, state.jet_idx)
+        height_added = len(rows) - len(state.rows)
+
+        # Maybe truncate if requested (potentially lossy)
+        if 0 < self.truncate_tower < len(rows):
+            rows = rows[-self.truncate_tower :]
+
+        return height_added, State(
+            jet_idx=jet_idx,
+            block_idx=(state.block_idx + 1) % N_SHAPES,
+            rows=bytes(rows),
+        )
 
+    def simulate_blocks(self, state: State, num_blocks: int) -> Tuple[int, State]:
+        height = 0
+        for _ in range(num_blocks):
+            num_added, new_state = self.simulate_block(state)
+            height += num_added
+            state = new_state
 
-def rows_to_str(rows: List[List[int]]) -> str:
-    return "\n".join([",".join([str(x) for x in r]) for r in rows])
+        return height, state
 
 
-@cache
-def simulate_block(state: State) -> Tuple[int, State]:
-    block = KERNELS[state.block_idx]
-    rows = str_to_rows(state.rows)
-    jet_idx = state.jet_idx
-    height_added = 0
-    # Coordinates of blc start at 2, -4
-    x = 2
-    y = 0
+def memo_tower_height(
+    cavern: Cavern, n_blocks: int, n_per_step: int = N_PER_STEP
+) -> int:
+    from tqdm import tqdm
 
-    while True:
-        jet_x = JETS[jet_idx]
-        jet_idx = (jet_idx + 1) % N_JETS
+    # the idea is to cache the input state... such that a cycle is eventually
+    # identified and the results for most steps are pulled from cache
+    state = starting_state()
+    height = 0
+    for _ in tqdm(range(n_blocks // n_per_step)):
+        delta_height, state = cavern.simulate_blocks(state, n_per_step)
+        height += delta_height
+    delta_height, _ = cavern.simulate_blocks(state, n_blocks % n_per_step)
+    return height + delta_height
 
-        # Check for horizontal collision - only move by jet if no collision
-        next_blc_x = x + jet_x
-        if not collision(rows, block=block, blc=(next_blc_x, y)):
-            x = next_blc_x
 
-        # Check for vertical collision - only move down if no collision
-        next_blc_y = y + 1
-        if collision(rows, block=block, blc=(x, next_blc_y)):
-            break
-        y = next_blc_y
-
-    # block at rest... calculate occupation for all rows
-    for i, row_idx in enumerate(range(y, y - block.shape[0], -1)):
-        block_row_occupation = calc_row_occupation(block, x=x, block_y=-(1 + i))
-        replacement_row = [a or b for a, b in zip(rows[row_idx], block_row_occupation)]
-        rows[row_idx] = replacement_row
-
-    # Expand cavern to account for occupied rows
-    first_occupied_row = next((row_idx for row_idx, row in enumerate(rows) if any(row)))
-    to_add = (STARTING_GAP + 1) - first_occupied_row
-    assert to_add <= (STARTING_GAP + 1)
-    rows = [empty_row() for _ in range(to_add)] + rows
-    height_added += to_add
-
-    # Maybe truncate if requested (potentially lossy)
-    if 0 < TRUNCATE_TOWER < len(rows):
-        rows = rows[:TRUNCATE_TOWER]
-
-    return height_added, State(
-        jet_idx=jet_idx,
-        block_idx=(state.block_idx + 1) % N_KERNELS,
-        rows=rows_to_str(rows),
-    )
+def tune_memo(
+    jets: List[int],
+    n_blocks: int,
+    truncations: List[int],
+    chunk_sizes: List[int],
+    memo_size: Optional[int] = MEMO_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Memo metrics for every TRUNCATE_TOWER and chunk size combination."""
+    for truncate_tower in truncations:
+        for n_per_step in chunk_sizes:
+            cavern = Cavern(jets, truncate_tower=truncate_tower, memo_size=memo_size)
+            start = time.perf_counter()
+            height = memo_tower_height(cavern, n_blocks, n_per_step=n_per_step)
+            yield {
+                "truncate_tower": truncate_tower,
+                "n_per_step": n_per_step,
+                "height": height,
+                "seconds": time.perf_counter() - start,
+                "block": cavern.simulate_block.stats,
+                "block_entries": len(cavern.simulate_block),
+                "blocks": cavern.simulate_blocks.stats,
+                "blocks_entries": len(cavern.simulate_blocks),
+            }
 
 
-@cache
-def simulate_blocks(state: State, num_blocks: int) -> Tuple[int, State]:
-    height = 0
-    for _ in range(num_blocks):
-        num_added, new_state = simulate_block(state=state)
-        height += num_added
-        state = new_state
+def parse(text: str) -> List[int]:
+    return [1 if c == ">" else -1 for c in text.strip()]
 
-    return height, state
+
+def starting_state() -> State:
+    return State(jet_idx=0, block_idx=0, rows=b"")
+
+
+def part1(jets: List[int]) -> int:
+    return tower_height(jets, 2022)
+
+
+def part2(jets: List[int], method: str = "cycle") -> int:
+    total = 1_000_000_000_000
+    if method == "cycle":
+        return tower_height(jets, total)
+
+    if method != "memo":
+        raise ValueError(f"Unknown method: {method}")
+
+    return memo_tower_height(Cavern(jets), total)
 
 
 if __name__ == "__main__":
-    starting_rows = [empty_row() for _ in range(4)]
+    with open(INPUT_FPATH, "r") as f:
+        jets = parse(f.read())
 
     print("Part #1:")
-    height, state = simulate_blocks(
-        state=State(jet_idx=0, block_idx=0, rows=rows_to_str(starting_rows)),
-        num_blocks=2022,
-    )
-    # display(str_to_rows(state.rows))
-    print(height)
+    print(part1(jets))
 
     print("Part #2:")
-    # the idea is to cache the input state... such that a cycle is eventually
-    # identified and the results for most steps are pulled from cache
-    total = 1_000_000_000_000
-    n_per_step = 100_000
-    state = State(jet_idx=0, block_idx=0, rows=rows_to_str(starting_rows))
-    height = 0
-    for _ in tqdm(range(total // n_per_step)):
-        delta_height, state = simulate_blocks(state=state, num_blocks=n_per_step)
-        height += delta_height
-    print(height)
+    print(part2(jets))
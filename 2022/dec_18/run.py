@@ -2,39 +2,44 @@ import numpy as np
 from typing import Tuple, Generator
 
 
-if __name__ == "__main__":
-    fpath = "input.txt"
+def parse(text: str) -> np.ndarray:
+    lines = [l for l in text.splitlines() if l.strip()]
+    return np.array(
+        [[int(s) for s in l.strip().split(",")] for l in lines], dtype=np.int32
+    )
 
-    with open(fpath, "r") as f:
-        lines = [l for l in f.readlines() if l.strip()]
 
-    voxels = np.array(
-        [[int(s) for s in l.strip().split(",")] for l in lines], dtype=np.int32
+def occupancy(voxels: np.ndarray) -> np.ndarray:
+    """Voxels as a dense boolean grid over their bounding box, plus an empty
+    border so every surface face lies inside the grid."""
+    lower = voxels.min(axis=0)
+    grid = np.zeros(voxels.max(axis=0) - lower + 3, dtype=bool)
+    grid[tuple((voxels - lower + 1).T)] = True
+    return grid
+
+
+def exposed_faces(grid: np.ndarray) -> int:
+    # a face shows wherever a filled cell and an empty one sit side by side
+    return sum(
+        int(np.count_nonzero(np.diff(grid, axis=axis))) for axis in range(grid.ndim)
     )
-    print(voxels.shape)
 
-    # Calculate the distance to each point
-    distances = np.linalg.norm(voxels[:, None, :] - voxels[None, :, :], axis=-1)
 
-    print("------------- Part #1: -------------")
-    # Find anywhere that represents two voxels touching
-    touching = distances[distances == 1]
-    # Surface area = total faces - faces in contact
-    surface_area = 6 * voxels.shape[0] - np.sum(touching)
-    print(surface_area)
+def part1(voxels: np.ndarray) -> int:
+    return exposed_faces(occupancy(voxels))
 
-    print("------------- Part #2: -------------")
+
+def part2(voxels: np.ndarray) -> int:
     search_space = [
-        (mn - 1, mx + 1)
+        (int(mn) - 1, int(mx) + 1)
         for mn, mx in zip(np.amin(voxels, axis=0), np.amax(voxels, axis=0))
     ]
-    print(search_space)
 
-    occupied = set([tuple(v) for v in voxels])
+    occupied = set([tuple(int(x) for x in v) for v in voxels])
     visited = set()
 
     def get_adjacent_nodes(
-        v: Tuple[int, int, int]
+        v: Tuple[int, int, int],
     ) -> Generator[Tuple[int, int, int], None, None]:
         for axis in range(3):
             # increment and decrement
@@ -71,4 +76,18 @@ if __name__ == "__main__":
                 to_search.append(next_v)
         return surface_area
 
-    print(flood_fill_bfs(v=tuple(a[0] for a in search_space)))
+    return flood_fill_bfs(v=tuple(a[0] for a in search_space))
+
+
+if __name__ == "__main__":
+    fpath = "input.txt"
+
+    with open(fpath, "r") as f:
+        voxels = parse(f.read())
+    print(voxels.shape)
+
+    print("------------- Part #1: -------------")
+    print(part1(voxels))
+
+    print("------------- Part #2: -------------")
+    print(part2(voxels))
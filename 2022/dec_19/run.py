@@ -77,9 +77,8 @@ class BluePrint:
         return max_geodes
 
 
-def parse_input(fpath: str) -> List[BluePrint]:
-    with open(fpath, "r") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
+def parse(text: str) -> List[BluePrint]:
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
 
     def parse_bp(line: str) -> BluePrint:
         return BluePrint(
@@ -101,11 +100,17 @@ def parse_input(fpath: str) -> List[BluePrint]:
     return [parse_bp(line) for line in lines]
 
 
-if __name__ == "__main__":
-    blueprints = parse_input("input.txt")
+def part1(blueprints: List[BluePrint]) -> int:
+    return sum((i + 1) * bp.geodes(24) for i, bp in enumerate(blueprints))
+
+
+def part2(blueprints: List[BluePrint]) -> int:
+    return math.prod([bp.geodes(32) for bp in blueprints[:3]])
 
-    quality_level = sum((i + 1) * bp.geodes(24) for i, bp in enumerate(blueprints))
-    print(f"Total quality level: {quality_level}")
 
-    geodes = [bp.geodes(32) for bp in blueprints[:3]]
-    print(f"First 3 quality levels multiplied: {math.prod(geodes)}")
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        blueprints = parse(f.read())
+
+    print(f"Total quality level: {part1(blueprints)}")
+    print(f"First 3 quality levels multiplied: {part2(blueprints)}")
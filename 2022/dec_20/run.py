@@ -28,24 +28,38 @@ def coordinates(mixed: List[Entry]) -> List[int]:
     ]
 
 
-if __name__ == "__main__":
-    fpath = "input.txt"
-    with open(fpath, "r") as f:
-        data = [int(l.strip()) for l in f.readlines() if l.strip()]
+DECRYPTION_KEY = 811589153
 
-    print("Part #1:")
+
+def parse(text: str) -> List[int]:
+    return [int(l.strip()) for l in text.splitlines() if l.strip()]
+
+
+def part1(data: List[int]) -> int:
     mixed = mix(
         original_entries=[Entry(value=v, original_idx=i) for i, v in enumerate(data)],
         n_mixes=1,
     )
-    print(sum(coordinates(mixed=mixed)))
+    return sum(coordinates(mixed=mixed))
 
-    print("Part #2")
-    DECRYPTION_KEY = 811589153
+
+def part2(data: List[int]) -> int:
     mixed = mix(
         original_entries=[
             Entry(value=v * DECRYPTION_KEY, original_idx=i) for i, v in enumerate(data)
         ],
         n_mixes=10,
     )
-    print(sum(coordinates(mixed=mixed)))
+    return sum(coordinates(mixed=mixed))
+
+
+if __name__ == "__main__":
+    fpath = "input.txt"
+    with open(fpath, "r") as f:
+        data = parse(f.read())
+
+    print("Part #1:")
+    print(part1(data))
+
+    print("Part #2")
+    print(part2(data))
@@ -1,7 +1,5 @@
 from dataclasses import dataclass
 from typing import Dict, Any, List, Set
-from sympy import sympify
-from sympy.solvers import solve
 
 
 @dataclass(frozen=True)
@@ -42,20 +40,31 @@ class Monkey:
         return {"+": a + b, "-": a - b, "*": a * b, "/": a / b}[parts[1]]
 
 
-def parse_input(fpath: str) -> List[Monkey]:
-    with open(fpath, "r") as f:
-        return [Monkey(s=l.strip()) for l in f.readlines() if l.strip()]
+def parse(text: str) -> List[Monkey]:
+    return [Monkey(s=l.strip()) for l in text.splitlines() if l.strip()]
 
 
-if __name__ == "__main__":
-    monkeys = parse_input("input.txt")
+def part1(monkeys: List[Monkey]) -> int:
     by_name = {m.name: m for m in monkeys}
+    return int(by_name["root"].compute(monkeys_by_name=by_name))
+
 
-    result = by_name["root"].compute(monkeys_by_name=by_name)
-    print(result)
+def part2(monkeys: List[Monkey]) -> int:
+    # sympy takes ~250ms to import and only part 2 needs it
+    from sympy import sympify
+    from sympy.solvers import solve
 
+    by_name = {m.name: m for m in monkeys}
     by_name["root"] = Monkey(s=by_name["root"].s.replace("+", "="))
     by_name["humn"] = Monkey(s="humn: x")
     eqn = by_name["root"].eqn(monkeys_by_name=by_name)
     sympy_eq = sympify("Eq(" + eqn.replace("=", ",") + ")")
-    print(solve(sympy_eq))
+    return int(solve(sympy_eq)[0])
+
+
+if __name__ == "__main__":
+    with open("input.txt", "r") as f:
+        monkeys = parse(f.read())
+
+    print(part1(monkeys))
+    print(part2(monkeys))
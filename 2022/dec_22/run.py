@@ -1,7 +1,6 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 import numpy as np
-from tqdm import tqdm
 
 CLOCK_ORDER = [
     "right",
@@ -268,9 +267,8 @@ class Game:
         return 1000 * row + 4 * col + dir
 
 
-def parse_input(fpath: str) -> Tuple[np.ndarray, List[Move]]:
-    with open(fpath, "r") as f:
-        lines = [l.strip("\n") for l in f.readlines() if l.strip()]
+def parse(text: str) -> Tuple[np.ndarray, List[Move]]:
+    lines = [l for l in text.splitlines() if l.strip()]
     mapping = {" ": 0, "#": 1, ".": 2}
     rows = [[mapping[x] for x in line] for line in lines[:-1]]
     size = max([len(r) for r in rows])
@@ -297,21 +295,31 @@ def parse_input(fpath: str) -> Tuple[np.ndarray, List[Move]]:
     return grid, instructions
 
 
-if __name__ == "__main__":
-    fpath = "test_input.txt"
-
-    grid, instructions = parse_input(fpath)
+def part1(model: Tuple[np.ndarray, List[Move]]) -> int:
+    from tqdm import tqdm
 
+    grid, instructions = model
     game = Game(grid=grid)
-
     for move in tqdm(instructions):
         game.move(move=move)
+    return game.answer()
+
 
-    print(game.answer())
+def part2(model: Tuple[np.ndarray, List[Move]]) -> int:
+    from tqdm import tqdm
 
+    grid, instructions = model
     game = Game(grid=grid)
     for move in tqdm(instructions):
         # print(move)
         game.move(move=move, cube=True)
+    return game.answer()
+
+
+if __name__ == "__main__":
+    fpath = "test_input.txt"
+    with open(fpath, "r") as f:
+        model = parse(f.read())
 
-    print(game.answer())
+    print(part1(model))
+    print(part2(model))
@@ -25,9 +25,8 @@ def get_adjacent(p: Point2D) -> Dict[str, Point2D]:
     return result
 
 
-def parse_input(fpath: str) -> Set[Point2D]:
-    with open(fpath, "r") as f:
-        lines = [l.strip() for l in f.readlines() if l.strip()]
+def parse(text: str) -> Set[Point2D]:
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
 
     elves = set()
     for y, row in enumerate(lines):
@@ -77,48 +76,59 @@ def display(elves: Set[Point2D]):
         print(s)
 
 
-if __name__ == "__main__":
+def play_round(elves: Set[Point2D], priorities: List[int]) -> Tuple[Set[Point2D], int]:
+    # print(priorities)
+    # display(elves)
+    # propose positions
+    proposals = {elf: propose(elf=elf, elves=elves, order=priorities) for elf in elves}
 
-    fpath = "input.txt"
-    elves = parse_input(fpath)
+    counts = {}
+    for p in proposals.values():
+        counts[p] = counts.get(p, 0) + 1
+
+    valid_proposals = set([p for p, count in counts.items() if count <= 1])
+
+    new_elves = []
+    n_moved = 0
+    for e, proposal in proposals.items():
+        if proposal in valid_proposals:
+            new_elves.append(proposal)
+            if e != proposal:
+                n_moved += 1
+        else:
+            new_elves.append(e)
+    return set(new_elves), n_moved
+
+
+def part1(elves: Set[Point2D]) -> int:
+    priorities = [0, 1, 2, 3]
+    for _ in range(10):
+        elves, _ = play_round(elves=elves, priorities=priorities)
+        # cycle priorities
+        priorities.append(priorities.pop(0))
+
+    min_p, max_p = bounds(elves)
+    w = max_p.x - min_p.x + 1
+    h = max_p.y - min_p.y + 1
+    return w * h - len(elves)
 
+
+def part2(elves: Set[Point2D]) -> int:
     priorities = [0, 1, 2, 3]
     round_idx = 0
     while True:
-        # print(priorities)
-        # display(elves)
-        # propose positions
-        proposals = {
-            elf: propose(elf=elf, elves=elves, order=priorities) for elf in elves
-        }
-
-        counts = {}
-        for p in proposals.values():
-            counts[p] = counts.get(p, 0) + 1
-
-        valid_proposals = set([p for p, count in counts.items() if count <= 1])
-
-        new_elves = []
-        n_moved = 0
-        for e, proposal in proposals.items():
-            if proposal in valid_proposals:
-                new_elves.append(proposal)
-                if e != proposal:
-                    n_moved += 1
-            else:
-                new_elves.append(e)
+        elves, n_moved = play_round(elves=elves, priorities=priorities)
         if n_moved == 0:
-            print("Part #2: ", round_idx + 1)
-            break
-        elves = set(new_elves)
-
+            return round_idx + 1
         # cycle priorities
         priorities.append(priorities.pop(0))
+        round_idx += 1
 
-        if round_idx == 9:
-            min_p, max_p = bounds(elves)
-            w = max_p.x - min_p.x + 1
-            h = max_p.y - min_p.y + 1
-            print("Part #1: ", w * h - len(elves))
 
-        round_idx += 1
+if __name__ == "__main__":
+    fpath = "input.txt"
+    with open(fpath, "r") as f:
+        elves = parse(f.read())
+
+    print("Part #1: ", part1(elves))
+    print("Part #2: ", part2(elves))
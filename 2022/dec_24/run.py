@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from functools import cache
-from typing import List, Set, Tuple
+from typing import Callable, List, Set, Tuple
 
 
 @dataclass(frozen=True)
@@ -15,21 +15,21 @@ class Blizzard:
     direction: str
 
 
-@cache
 def step_blizzard(blizzard: Blizzard, w: int, h: int) -> Blizzard:
     x = blizzard.position.x + {">": 1, "<": -1}.get(blizzard.direction, 0)
     y = blizzard.position.y + {"v": 1, "^": -1}.get(blizzard.direction, 0)
     return Blizzard(position=Point2D(x=x % w, y=y % h), direction=blizzard.direction)
 
 
-@cache
-def step(blizzards: Tuple, w: int, h: int) -> List[Blizzard]:
-    return [step_blizzard(b, w=w, h=h) for b in blizzards]
+# not memoised - keyed on every blizzard state seen, the cache would only grow
+def step(
+    blizzards: Tuple, w: int, h: int, step_one: Callable = step_blizzard
+) -> List[Blizzard]:
+    return [step_one(b, w=w, h=h) for b in blizzards]
 
 
-def parse_input(fpath: str) -> Tuple[Point2D, Point2D, Tuple[int, int], List[Blizzard]]:
-    with open(fpath, "r") as f:
-        lines = [l.strip() for l in f.readlines()]
+def parse(text: str) -> Tuple[Point2D, Point2D, Tuple[int, int], List[Blizzard]]:
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
 
     h = len(lines) - 2
     w = len(lines[0]) - 2
@@ -46,7 +46,6 @@ def parse_input(fpath: str) -> Tuple[Point2D, Point2D, Tuple[int, int], List[Bli
     return start, goal, (w, h), blizzards
 
 
-@cache
 def all_next(p: Point2D) -> Set[Point2D]:
     return {
         p,
@@ -73,13 +72,16 @@ def display(blizzards: List[Blizzard], position: Point2D, h: int, w: int):
 def bfs(
     start: Point2D, goals: List[Point2D], w: int, h: int, blizzards: List[Blizzard]
 ) -> int:
+    # memoised per search, so nothing outlives the valley it was built for
+    step_one = cache(step_blizzard)
+    neighbours = cache(all_next)
     targets = [g for g in goals]
     n_turns = 0
     q = {start}
     while q:
         # display(blizzards=blizzards, position=None, h=h, w=w)
         n_turns += 1
-        next_blizzards = step(blizzards=tuple(blizzards), w=w, h=h)
+        next_blizzards = step(blizzards=tuple(blizzards), w=w, h=h, step_one=step_one)
         blocked = set([b.position for b in next_blizzards])
 
         if targets[0] in q:
@@ -88,7 +90,7 @@ def bfs(
                 return n_turns - 1
         to_check, q = q, set()
         for p in to_check:
-            for n in all_next(p):
+            for n in neighbours(p):
                 if n in blocked or n in q:
                     continue
                 if n == targets[0]:
@@ -101,13 +103,20 @@ def bfs(
     assert False, "Never get here"
 
 
+def part1(model: Tuple[Point2D, Point2D, Tuple[int, int], List[Blizzard]]) -> int:
+    start, goal, (w, h), blizzards = model
+    return bfs(start=start, goals=[goal], w=w, h=h, blizzards=blizzards)
+
+
+def part2(model: Tuple[Point2D, Point2D, Tuple[int, int], List[Blizzard]]) -> int:
+    start, goal, (w, h), blizzards = model
+    return bfs(start=start, goals=[goal, start, goal], w=w, h=h, blizzards=blizzards)
+
+
 if __name__ == "__main__":
     fpath = "input.txt"
-    start, goal, (w, h), blizzards = parse_input(fpath)
+    with open(fpath, "r") as f:
+        model = parse(f.read())
 
-    print("Part #1", bfs(start=start, goals=[goal], w=w, h=h, blizzards=blizzards))
-    start, goal, (w, h), blizzards = parse_input(fpath)
-    print(
-        "Part #2",
-        bfs(start=start, goals=[goal, start, goal], w=w, h=h, blizzards=blizzards),
-    )
+    print("Part #1", part1(model))
+    print("Part #2", part2(model))
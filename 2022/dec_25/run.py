@@ -1,3 +1,5 @@
+from typing import List
+
 POW_5 = [5**i for i in range(40)]
 
 
@@ -57,12 +59,25 @@ def snafu_to_int(s: str) -> int:
     return sum([(5**i) * d for i, d in enumerate(digits[::-1])])
 
 
-if __name__ == "__main__":
-    fpath = "test_input.txt"
-    with open(fpath, "r") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
+def parse(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
 
+
+def part1(lines: List[str]) -> str:
     # for s in lines:
     #     print(s, snafu_to_int(s), int_to_snafu(x=snafu_to_int(s)))
     total = sum([snafu_to_int(s) for s in lines])
-    print("Part #1: ", total, int_to_snafu(x=total))
+    return int_to_snafu(x=total)
+
+
+def part2(lines: List[str]) -> None:
+    # the last day only has the one puzzle
+    return None
+
+
+if __name__ == "__main__":
+    fpath = "test_input.txt"
+    with open(fpath, "r") as f:
+        lines = parse(f.read())
+
+    print("Part #1: ", part1(lines))
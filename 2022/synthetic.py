@@ -0,0 +1,439 @@
+"""Synthetic puzzle input generators, keyed by day directory name.
+
+Each generator takes a ``size`` (the main scaling knob for that day, see the
+individual docstrings) and a ``seed`` and returns the puzzle text in the same
+format as the checked-in ``input.txt``.
+"""
+
+import math
+import random
+import string
+from typing import Callable, Dict, List
+
+SNAFU_DIGITS = {0: "0", 1: "1", 2: "2", -1: "-", -2: "="}
+
+
+def calories(size: int, seed: int = 0) -> str:
+    """``size`` elves."""
+    rng = random.Random(seed)
+    return "\n\n".join(
+        "\n".join(str(rng.randint(1000, 9999)) for _ in range(rng.randint(1, 15)))
+        for _ in range(size)
+    )
+
+
+def strategy_guide(size: int, seed: int = 0) -> str:
+    """``size`` rounds."""
+    rng = random.Random(seed)
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(size))
+
+
+def rucksacks(size: int, seed: int = 0) -> str:
+    """``size`` rucksacks (rounded up to a whole number of 3-elf groups)."""
+    rng = random.Random(seed)
+    letters = string.ascii_letters
+    lines = []
+    for _ in range((size + 2) // 3):
+        badge = rng.choice(letters)
+        pool = [c for c in letters if c != badge]
+        rng.shuffle(pool)
+        for own in (pool[0:17], pool[17:34], pool[34:51]):
+            common, rest = own[0], own[1:]
+            side_a, side_b = rest[:8], rest[8:]
+            n = rng.randint(4, 16)
+            left = [common, badge] + [rng.choice(side_a) for _ in range(n - 2)]
+            right = [common] + [rng.choice(side_b) for _ in range(n - 1)]
+            rng.shuffle(left)
+            rng.shuffle(right)
+            lines.append("".join(left + right))
+    return "\n".join(lines)
+
+
+def section_pairs(size: int, seed: int = 0) -> str:
+    """``size`` pairs of section ranges."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        ranges = []
+        for _ in range(2):
+            a = rng.randint(1, 99)
+            ranges.append(f"{a}-{rng.randint(a, 99)}")
+        lines.append(",".join(ranges))
+    return "\n".join(lines)
+
+
+def crate_stacks(size: int, seed: int = 0) -> str:
+    """``size`` move instructions over 9 stacks up to ~sqrt(``size``) crates high."""
+    rng = random.Random(seed)
+    n_stacks, max_height = 9, max(8, math.isqrt(size))
+    stacks = [
+        [rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, max_height))]
+        for _ in range(n_stacks)
+    ]
+    header = []
+    for level in range(max_height - 1, -1, -1):
+        header.append(
+            " ".join(f"[{s[level]}]" if level < len(s) else "   " for s in stacks)
+        )
+    header.append(" ".join(f" {i + 1} " for i in range(n_stacks)))
+
+    heights = [len(s) for s in stacks]
+    moves = []
+    for _ in range(size):
+        src = rng.choice([i for i, h in enumerate(heights) if h > 0])
+        dst = rng.choice([i for i in range(n_stacks) if i != src])
+        n = rng.randint(1, heights[src])
+        heights[src] -= n
+        heights[dst] += n
+        moves.append(f"move {n} from {src + 1} to {dst + 1}")
+    return "\n".join(header) + "\n\n" + "\n".join(moves)
+
+
+def signal(size: int, seed: int = 0) -> str:
+    """``size`` characters, with a 14-character marker near the end."""
+    rng = random.Random(seed)
+    noise = "abcdefghijkl"
+    marker = rng.sample(string.ascii_lowercase, 14)
+    n = max(size - len(marker) - 1, 0)
+    return "".join(rng.choice(noise) for _ in range(n)) + "".join(marker) + "a"
+
+
+def terminal_log(size: int, seed: int = 0) -> str:
+    """``size`` files spread over a random directory tree."""
+    rng = random.Random(seed)
+    tree: Dict = {}
+    dirs = [tree]
+    for i in range(size):
+        parent = rng.choice(dirs)
+        if rng.random() < 0.2:
+            child: Dict = {}
+            parent[f"d{i}"] = child
+            dirs.append(child)
+        else:
+            parent[f"f{i}.txt"] = rng.randint(1, 300000)
+
+    lines = ["$ cd /"]
+
+    def walk(node: Dict) -> None:
+        lines.append("$ ls")
+        for name, v in node.items():
+            lines.append(f"dir {name}" if isinstance(v, dict) else f"{v} {name}")
+        for name, v in node.items():
+            if isinstance(v, dict):
+                lines.append(f"$ cd {name}")
+                walk(v)
+                lines.append("$ cd ..")
+
+    walk(tree)
+    return "\n".join(lines)
+
+
+def tree_grid(size: int, seed: int = 0) -> str:
+    """``size`` x ``size`` forest."""
+    rng = random.Random(seed)
+    return "\n".join(
+        "".join(rng.choice(string.digits) for _ in range(size)) for _ in range(size)
+    )
+
+
+def rope_moves(size: int, seed: int = 0) -> str:
+    """``size`` move instructions."""
+    rng = random.Random(seed)
+    return "\n".join(f"{rng.choice('RLUD')} {rng.randint(1, 20)}" for _ in range(size))
+
+
+def cpu_program(size: int, seed: int = 0) -> str:
+    """``size`` instructions (at least enough to draw one CRT frame)."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(max(size, 240)):
+        if rng.random() < 0.3:
+            lines.append("noop")
+        else:
+            lines.append(f"addx {rng.randint(-10, 10)}")
+    return "\n".join(lines)
+
+
+def monkeys(size: int, seed: int = 0) -> str:
+    """``size`` monkeys (at least 2)."""
+    rng = random.Random(seed)
+    size = max(size, 2)
+    primes = [p for p in range(2, 10000) if all(p % d for d in range(2, p))]
+    divisors = primes[:size]
+    blocks = []
+    for i in range(size):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        # no "old * old" and small factors, part 1 never reduces worry modulo the
+        # divisors and random throw targets would otherwise blow it up into
+        # huge ints within 20 rounds
+        op = rng.choice([f"old * {rng.randint(2, 7)}", f"old + {rng.randint(1, 8)}"])
+        others = [j for j in range(size) if j != i]
+        blocks.append(
+            "\n".join(
+                [
+                    f"Monkey {i}:",
+                    f"  Starting items: {items}",
+                    f"  Operation: new = {op}",
+                    f"  Test: divisible by {divisors[i]}",
+                    f"    If true: throw to monkey {rng.choice(others)}",
+                    f"    If false: throw to monkey {rng.choice(others)}",
+                ]
+            )
+        )
+    return "\n\n".join(blocks)
+
+
+def heightmap(size: int, seed: int = 0) -> str:
+    """``size`` x ``size`` heightmap with a climbable path along the border."""
+    rng = random.Random(seed)
+    size = max(size, 14)
+    span = 2 * (size - 1)
+    rows = []
+    for y in range(size):
+        row = ""
+        for x in range(size):
+            h = min(25, (x + y) * 26 // span)
+            if y != 0 and x != size - 1 and rng.random() < 0.4:
+                h = rng.randint(0, h)
+            row += string.ascii_lowercase[h]
+        rows.append(row)
+    rows[0] = "S" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "E"
+    return "\n".join(rows)
+
+
+def packets(size: int, seed: int = 0) -> str:
+    """``size`` pairs of packets."""
+    rng = random.Random(seed)
+
+    def packet(depth: int = 0) -> str:
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                items.append(packet(depth + 1))
+            else:
+                items.append(str(rng.randint(0, 10)))
+        return "[" + ",".join(items) + "]"
+
+    return "\n\n".join(f"{packet()}\n{packet()}" for _ in range(size))
+
+
+def rock_paths(size: int, seed: int = 0) -> str:
+    """``size`` rock paths below the sand entry point."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        x, y = rng.randint(440, 560), rng.randint(5, 160)
+        points = [f"{x},{y}"]
+        for i in range(rng.randint(1, 4)):
+            if i % 2:
+                y = min(y + rng.randint(1, 8), 170)
+            else:
+                x += rng.randint(-10, 10)
+            points.append(f"{x},{y}")
+        lines.append(" -> ".join(points))
+    return "\n".join(lines)
+
+
+def sensors(size: int, seed: int = 0) -> str:
+    """``size`` sensors whose ranges all stop just short of one hidden point."""
+    rng = random.Random(seed)
+    limit = 4000000
+    hidden_x, hidden_y = rng.randint(0, limit), rng.randint(0, limit)
+    lines = []
+    for _ in range(size):
+        sx, sy = rng.randint(0, limit), rng.randint(0, limit)
+        r = max(abs(sx - hidden_x) + abs(sy - hidden_y) - 1, 1)
+        dx = rng.randint(-r, r)
+        dy = (r - abs(dx)) * rng.choice([-1, 1])
+        lines.append(
+            f"Sensor at x={sx}, y={sy}: closest beacon is at x={sx + dx}, y={sy + dy}"
+        )
+    return "\n".join(lines)
+
+
+def valves(size: int, seed: int = 0) -> str:
+    """``size`` valves in a connected tunnel network, a quarter of them with flow."""
+    rng = random.Random(seed)
+    names = ["AA"] + [
+        a + b
+        for a in string.ascii_uppercase
+        for b in string.ascii_uppercase
+        if a + b != "AA"
+    ]
+    names = names[: max(size, 2)]
+    edges: Dict[str, set] = {n: set() for n in names}
+    for i, name in enumerate(names[1:], start=1):
+        other = names[rng.randrange(i)]
+        edges[name].add(other)
+        edges[other].add(name)
+    for _ in range(len(names) // 3):
+        a, b = rng.sample(names, 2)
+        edges[a].add(b)
+        edges[b].add(a)
+    useful = set(rng.sample(names[1:], len(names) // 4))
+    lines = []
+    for name in names:
+        rate = rng.randint(1, 25) if name in useful else 0
+        tunnels = sorted(edges[name])
+        plural = (
+            "tunnels lead to valves" if len(tunnels) > 1 else "tunnel leads to valve"
+        )
+        lines.append(
+            f"Valve {name} has flow rate={rate}; {plural} {', '.join(tunnels)}"
+        )
+    return "\n".join(lines)
+
+
+def jets(size: int, seed: int = 0) -> str:
+    """``size`` jet directions."""
+    rng = random.Random(seed)
+    return "".join(rng.choice("<>") for _ in range(size))
+
+
+def droplet(size: int, seed: int = 0) -> str:
+    """``size`` distinct voxels packed into a cube."""
+    rng = random.Random(seed)
+    side = max(int(round((2 * size) ** (1 / 3))), 2)
+    size = min(size, side**3)
+    voxels = set()
+    while len(voxels) < size:
+        voxels.add(tuple(rng.randint(1, side) for _ in range(3)))
+    return "\n".join(",".join(str(v) for v in voxel) for voxel in voxels)
+
+
+def blueprints(size: int, seed: int = 0) -> str:
+    """``size`` robot blueprints."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        lines.append(
+            f"Blueprint {i + 1}: "
+            f"Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore and {rng.randint(5, 20)} obsidian."
+        )
+    return "\n".join(lines)
+
+
+def encrypted_file(size: int, seed: int = 0) -> str:
+    """``size`` numbers containing a single zero."""
+    rng = random.Random(seed)
+    values = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(size - 1)]
+    values.insert(rng.randint(0, len(values)), 0)
+    return "\n".join(str(v) for v in values)
+
+
+def monkey_math(size: int, seed: int = 0) -> str:
+    """``size`` operation monkeys, with ``humn`` appearing exactly once."""
+    rng = random.Random(seed)
+    n_ops = max(size, 1)
+    names = set()
+    while len(names) < 2 * n_ops + 1:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(4))
+        if name not in {"root", "humn"}:
+            names.add(name)
+    pool = sorted(names)
+    rng.shuffle(pool)
+
+    jobs: Dict[str, str] = {}
+    leaves = ["root"]
+    for _ in range(n_ops):
+        name = leaves.pop(rng.randrange(len(leaves)))
+        a, b = pool.pop(), pool.pop()
+        # no "-" or "/" so every monkey yields a positive, non-zero number
+        op = "+" if name == "root" else rng.choice("++++*")
+        jobs[name] = f"{a} {op} {b}"
+        leaves += [a, b]
+    humn = rng.randrange(len(leaves))
+    for i, name in enumerate(leaves):
+        jobs["humn" if i == humn else name] = str(rng.randint(1, 9))
+        if i == humn:
+            for k, v in jobs.items():
+                jobs[k] = " ".join("humn" if t == name else t for t in v.split())
+    return "\n".join(f"{k}: {v}" for k, v in jobs.items())
+
+
+def elves(size: int, seed: int = 0) -> str:
+    """``size`` x ``size`` grove scan at ~50% density."""
+    rng = random.Random(seed)
+    return "\n".join(
+        "".join("#" if rng.random() < 0.5 else "." for _ in range(size))
+        for _ in range(size)
+    )
+
+
+def blizzard_valley(size: int, seed: int = 0) -> str:
+    """Valley ``size`` wide and ``size // 5`` tall."""
+    rng = random.Random(seed)
+    w, h = max(size, 3), max(size // 5, 3)
+    rows = ["#." + w * "#"]
+    for y in range(h):
+        row = ""
+        for x in range(w):
+            choices = "<>" if x in {0, w - 1} else "<>^v"
+            row += rng.choice(choices) if rng.random() < 0.2 else "."
+        if y == 0:
+            # the solver can't wait at the entrance, keep the first step clear
+            row = (
+                row[0]
+                + row[1].replace("<", ".")
+                + row[2:-1]
+                + row[-1].replace(">", ".")
+            )
+        rows.append("#" + row + "#")
+    rows.append(w * "#" + ".#")
+    return "\n".join(rows)
+
+
+def int_to_snafu(x: int) -> str:
+    digits = []
+    while x:
+        d = (x + 2) % 5 - 2
+        digits.append(SNAFU_DIGITS[d])
+        x = (x - d) // 5
+    return "".join(digits[::-1]) or "0"
+
+
+def snafu_numbers(size: int, seed: int = 0) -> str:
+    """``size`` SNAFU numbers."""
+    rng = random.Random(seed)
+    return "\n".join(int_to_snafu(rng.randint(1, 10**12)) for _ in range(size))
+
+
+GENERATORS: Dict[str, Callable[[int, int], str]] = {
+    "dec_01": calories,
+    "dec_02": strategy_guide,
+    "dec_03": rucksacks,
+    "dec_04": section_pairs,
+    "dec_05": crate_stacks,
+    "dec_06": signal,
+    "dec_07": terminal_log,
+    "dec_08": tree_grid,
+    "dec_09": rope_moves,
+    "dec_10": cpu_program,
+    "dec_11": monkeys,
+    "dec_12": heightmap,
+    "dec_13": packets,
+    "dec_14": rock_paths,
+    "dec_15": sensors,
+    "dec_16": valves,
+    "dec_17": jets,
+    "dec_18": droplet,
+    "dec_19": blueprints,
+    "dec_20": encrypted_file,
+    "dec_21": monkey_math,
+    # dec_22 needs a cube net in a specific layout... benchmarks use input.txt
+    "dec_23": elves,
+    "dec_24": blizzard_valley,
+    "dec_25": snafu_numbers,
+}
+
+
+def generate(day: str, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, seed)
+
+
+def available() -> List[str]:
+    return sorted(GENERATORS)